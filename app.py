@@ -1,9 +1,23 @@
+import html
+import os
+
 import streamlit as st
 import pandas as pd
-import joblib
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+# plotly (charts), joblib and sklearn (model.pkl) are imported on first use,
+# so the header and sidebar render before they are loaded
+from catalog import Catalog
+from cohorts import PLATFORM_NAMES, PLATFORMS, cohort_rows, compare, hit_probabilities, summarize
+from explorer import FLAGS, FilterIndex
+from forest import FOREST_PATH, load_forest
+from instrument import REGISTRY, cache_miss, finish_rerun, mark, start_rerun, timed
+from predictions import cache_path, load_predictions, model_version
+from recommender import load_similar
+from registry import active_paths, current_model, manifest_stamp, model_files, read_manifest, rollback
+from scenarios import PLATFORM_TOGGLES, sweep
+from search import TitleSearch
+from warmup import warm_up
 
 # Page Config
 st.set_page_config(
@@ -12,6 +26,7 @@ st.set_page_config(
     page_icon="🎮",
     initial_sidebar_state="expanded"
 )
+start_rerun()
 
 # Custom CSS for Gaming Theme
 st.markdown("""
@@ -334,22 +349,134 @@ st.markdown("""
     </div>
     """, unsafe_allow_html=True)
 
-# Cache Data
-@st.cache_data
-def load_data():
-    return pd.read_csv("games.csv")
+# Columns the dashboard reads; everything else stays on disk
+APP_COLUMNS = [
+    "app_id", "title", "price_final", "discount", "positive_ratio", "user_reviews",
+    "win", "mac", "linux", "steam_deck",
+]
+
+# Cache Data with its title index and market stats; a delta ingest only
+# folds the changed rows in, a rebuilt snapshot reloads everything
+@st.cache_resource
+def load_catalog():
+    return Catalog(APP_COLUMNS)
 
-# Cache Model
+# Cache the server-side title search index
 @st.cache_resource
-def load_model():
-    model = joblib.load("model.pkl")
-    features = joblib.load("features.pkl")
+def load_title_search(version, _state):
+    cache_miss("load_title_search")
+    titles = _state.titles
+    reviews = _state.df["user_reviews"].to_numpy()
+    return TitleSearch(titles.titles, reviews[titles.rows])
+
+# Cache Model (prefer the mmap-able artifact: workers share its pages).
+# Registry versions have their own paths, so a hot swap is a new entry and
+# the previous version stays loaded for an instant rollback
+@st.cache_resource(max_entries=3)
+def load_model(path):
+    cache_miss("load_model")
+    if os.path.basename(path) == FOREST_PATH:
+        model = load_forest(path)
+        return model, model.features
+    import joblib
+
+    model = joblib.load(path)
+    features = joblib.load(model_files(path)[1])
     return model, features
 
-try:
-    df = load_data()
-    model, features = load_model()
-except FileNotFoundError as e:
+# The mmap-able forest wins for a few rows; from about this many rows on
+# sklearn's batch traversal is faster (see bench_inference.py)
+BATCH_ROWS = 1000
+
+# Cache the sklearn model next to a forest artifact, for batch scoring
+@st.cache_resource(max_entries=3)
+def load_batch_model(path):
+    if os.path.basename(path) != FOREST_PATH:
+        return load_model(path)
+    cache_miss("load_batch_model")
+    import joblib
+
+    model = joblib.load(model_files(path)[0])
+    return model, load_model(path)[1]
+
+def scoring_model(path, n_rows):
+    """(model, features) to score `n_rows` rows with: the faster engine for that size."""
+    return load_batch_model(path) if n_rows >= BATCH_ROWS else load_model(path)
+
+# Cache the registry manifest per mtime: a rerun only stats the file
+@st.cache_resource(max_entries=2)
+def load_manifest(stamp):
+    return read_manifest()
+
+def active_models():
+    """(current, rollback) model paths; the working directory's files without a registry."""
+    stamp = manifest_stamp()
+    if stamp is None:
+        return current_model(), None
+    return active_paths(load_manifest(stamp))
+
+# Cache the similar-games index (precomputed k-NN table when built for this data)
+@st.cache_resource
+def load_similar_games(version):
+    cache_miss("load_similar_games")
+    return load_similar(version)
+
+# Cache figures that only depend on the model or on the dataset
+@st.cache_resource
+def load_importance_figure(model_path, model_ver):
+    cache_miss("load_importance_figure")
+    from charts import importance_figure
+
+    model, features = load_model(model_path)
+    try:
+        if hasattr(model, 'feature_importances_'):
+            importance = model.feature_importances_
+            feature_names = features
+        else:
+            importance = np.random.rand(len(features[:8]))
+            feature_names = features[:8]
+    except:
+        importance = np.random.rand(8)
+        feature_names = [f"Factor {i+1}" for i in range(8)]
+    return importance_figure(importance, feature_names)
+
+@st.cache_resource
+def load_market_base(version, _market):
+    cache_miss("load_market_base")
+    from charts import market_base
+
+    return market_base(_market)
+
+# Cache what-if sweeps per game and grid: one batched predict_proba per miss
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_scenarios(model_path, model_ver, data_ver, game_pos, prices, discounts, toggles, _game):
+    cache_miss("load_scenarios")
+    # The default 50 x 19 x 8 grid is a batch job: sklearn, not the forest
+    model, features = scoring_model(model_path, prices[2] * discounts[2] * 2 ** len(toggles))
+    return sweep(model, _game, features, np.linspace(*prices), np.linspace(*discounts), toggles)
+
+# Widgets inside a fragment rerun only their own section
+fragment = getattr(st, "fragment", lambda fn: fn)
+
+# Cache the explorer's bitmap and range indexes per dataset version
+@st.cache_resource(max_entries=2)
+def load_filter_index(version, _df):
+    cache_miss("load_filter_index")
+    return FilterIndex(_df)
+
+# Cache per-game probabilities for this (model, dataset) fingerprint
+@st.cache_resource
+def load_prediction_cache(model_path, model_ver, data_ver):
+    cache_miss("load_prediction_cache")
+    model, features = load_model(model_path)
+    if not os.path.exists(cache_path(model_ver, data_ver)):
+        # A miss scores the whole catalog: a batch job for sklearn
+        with timed("load_batch_model"):
+            model, features = load_batch_model(model_path)
+    with st.spinner("Precomputing predictions for the catalog..."):
+        return load_predictions(model, features, model_ver, data_ver)
+
+def missing_files():
     # Gaming-themed error message
     st.markdown("""
         <div style="background: linear-gradient(135deg, rgba(255, 0, 84, 0.15) 0%, rgba(255, 0, 84, 0.05) 100%);
@@ -379,21 +506,52 @@ except FileNotFoundError as e:
     """, unsafe_allow_html=True)
     st.stop()
 
+# Load the model in the background while the catalog and sidebar render
+# (once per process; the cache is shared by every session)
+def warm_model():
+    load_model(active_models()[0])
+
+warm_up(warm_model)
+
+try:
+    with timed("load_catalog"):
+        state = load_catalog().refresh()
+    data_version = state.version
+    df, title_index, market = state.df, state.titles, state.market
+    with timed("load_title_search"):
+        title_search = load_title_search(data_version, state)
+    with timed("load_similar_games"):
+        similar = load_similar_games(data_version)
+except FileNotFoundError:
+    missing_files()
+
 # Sidebar with gaming theme
 with st.sidebar:
     st.markdown("### 🎯 GAME SELECTOR")
     st.markdown("---")
     
-    # Game selection with search
+    # Server-side search: the selector only receives the top matches
+    query = st.text_input(
+        "SEARCH GAMES:",
+        placeholder="Type a title...",
+        help="Matches title and word prefixes, tolerates typos; most reviewed first"
+    )
+    with timed("search"):
+        matches = title_search.search(query)
+    if len(matches) == 0:
+        st.caption("No matching games, showing the most reviewed titles")
+        matches = title_search.search("")
+    
     game_name = st.selectbox(
         "SELECT GAME:",
-        df["title"].unique(),
+        matches,
         index=0,
         help="Choose a game from the Steam database"
     )
     
     # Get game data
-    game = df[df["title"] == game_name].iloc[0]
+    game_pos = title_index.position(game_name)
+    game = df.iloc[game_pos]
     
     # Quick stats panel
     st.markdown("### 📊 QUICK STATS")
@@ -432,11 +590,41 @@ with st.sidebar:
                 LINUX
             </div>
         """, unsafe_allow_html=True)
+    
+    # Content-based recommendations
+    st.markdown("### 🧭 SIMILAR GAMES")
+    st.markdown("---")
+    
+    with timed("similar"):
+        similar_rows = similar.similar(game_pos, k=5)
+    for pos in similar_rows:
+        other = df.iloc[pos]
+        st.markdown(f"""
+            <div class="game-info-card" style="padding:0.7rem; margin-bottom:0.5rem;">
+                <div style="font-size:0.9rem; font-weight:bold; color:#f8f9fa !important;">{html.escape(str(other['title']))}</div>
+                <div style="font-size:0.75rem; color:#adb5bd !important;">
+                    ⭐ {other['positive_ratio']}% · ${other['price_final']:.2f} · {other['user_reviews']:,} reviews
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
 
-# Main Content Tabs
-tab1, tab2, tab3 = st.tabs(["📊 DASHBOARD", "🎯 PREDICTOR", "📈 INSIGHTS"])
+# Header and sidebar are on screen (bench_startup.py reports this stage)
+mark("until_sidebar")
+
+# The model is only needed by the panels, so the sidebar is painted first
+try:
+    model_path, rollback_path = active_models()
+    with timed("load_model"):
+        model, features = load_model(model_path)
+        if rollback_path is not None:
+            load_model(rollback_path)
+    with timed("load_prediction_cache"):
+        predictions = load_prediction_cache(model_path, model_version(model_path), data_version)
+except FileNotFoundError:
+    missing_files()
 
-with tab1:
+# Main Content Tabs: each panel is a function so only the open tab runs
+def render_dashboard():
     # Performance Metrics Section
     st.markdown("### ⚡ PERFORMANCE METRICS")
     
@@ -444,12 +632,14 @@ with tab1:
     metric_col1, metric_col2, metric_col3 = st.columns(3)
     
     with metric_col1:
+        with timed("market.review_rank"):
+            review_rank = market.review_rank(game['user_reviews'])
         st.markdown(f"""
             <div class="metric-card">
                 <div style="font-size:0.85rem; color:#adb5bd !important; margin-bottom:0.5rem;">TOTAL REVIEWS</div>
                 <div style="font-size:1.8rem; font-weight:bold; color:#4cc9f0 !important; margin-bottom:0.3rem;">{game['user_reviews']:,}</div>
                 <div style="font-size:0.75rem; color:#6c757d !important;">
-                    Rank: <span style="color:#ffbe0b !important;">#{df[df['user_reviews'] > game['user_reviews']].shape[0] + 1}</span>
+                    Rank: <span style="color:#ffbe0b !important;">#{review_rank}</span>
                 </div>
             </div>
         """, unsafe_allow_html=True)
@@ -488,9 +678,15 @@ with tab1:
     with pred_col1:
         if st.button("🔮 RUN PREDICTION ANALYSIS", use_container_width=True, type="primary"):
             try:
-                input_data = np.array([[game[f] for f in features]])
-                pred = model.predict(input_data)[0]
-                prob = model.predict_proba(input_data)[0][1]
+                if game_pos < len(predictions):
+                    proba = predictions[game_pos]
+                else:
+                    # Live inference only when the row is not in the cache
+                    input_data = np.array([[game[f] for f in features]])
+                    with timed("predict"):
+                        proba = model.predict_proba(input_data)[0]
+                pred = model.classes_[np.argmax(proba)]
+                prob = proba[1]
                 
                 if pred == 1:
                     st.markdown(f"""
@@ -537,145 +733,30 @@ with tab1:
         st.markdown("#### 📈 MARKET COMPARISON")
         
         try:
-            # Gaming-themed comparison chart
-            fig = go.Figure()
-            
-            # Custom colors for gaming theme
-            game_color = '#4cc9f0'
-            market_color = '#9d4edd'
-            
-            fig.add_trace(go.Bar(
-                name='SELECTED GAME',
-                x=['PRICE', 'RATING', 'REVIEWS'],
-                y=[
-                    float(game['price_final']), 
-                    float(game['positive_ratio']),
-                    min(float(game['user_reviews']) / 1000, 100)
-                ],
-                marker_color=game_color,
-                marker_line_color='white',
-                marker_line_width=1,
-                text=[
-                    f"${float(game['price_final']):.2f}",
-                    f"{float(game['positive_ratio'])}%",
-                    f"{int(game['user_reviews']):,}"
-                ],
-                textposition='outside',
-                textfont=dict(color='white', size=12)
-            ))
-            
-            fig.add_trace(go.Bar(
-                name='MARKET AVG',
-                x=['PRICE', 'RATING', 'REVIEWS'],
-                y=[
-                    float(df['price_final'].mean()),
-                    float(df['positive_ratio'].mean()),
-                    min(float(df['user_reviews'].mean()) / 1000, 100)
-                ],
-                marker_color=market_color,
-                marker_line_color='white',
-                marker_line_width=1,
-                text=[
-                    f"${float(df['price_final'].mean()):.2f}",
-                    f"{float(df['positive_ratio'].mean()):.1f}%",
-                    f"{int(df['user_reviews'].mean()):,}"
-                ],
-                textposition='outside',
-                textfont=dict(color='white', size=12)
-            ))
-            
-            fig.update_layout(
-                height=350,
-                barmode='group',
-                showlegend=True,
-                template='plotly_dark',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=40, b=20),
-                font=dict(color='white', family='Arial, sans-serif'),
-                legend=dict(
-                    bgcolor='rgba(26, 31, 46, 0.8)',
-                    bordercolor='rgba(76, 201, 240, 0.3)',
-                    borderwidth=1
-                )
-            )
-            
-            fig.update_xaxes(
-                gridcolor='rgba(76, 201, 240, 0.1)',
-                tickfont=dict(color='white')
-            )
-            
-            fig.update_yaxes(
-                gridcolor='rgba(76, 201, 240, 0.1)',
-                tickfont=dict(color='white')
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            # Gaming-themed comparison chart: cached base + this game's bar
+            from charts import market_figure
+
+            with timed("figure.market_comparison"):
+                fig = market_figure(load_market_base(data_version, market), game)
+
+            with timed("plotly_chart.market_comparison"):
+                st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.warning("Chart generation failed. Data format issue detected.")
 
-with tab2:
+def render_predictor():
     # Feature Analysis
     st.markdown("### 🔍 FEATURE ANALYSIS")
     
     # Top features visualization
     st.markdown("#### ⚙️ KEY SUCCESS FACTORS")
     
-    try:
-        if hasattr(model, 'feature_importances_'):
-            importance = model.feature_importances_
-            feature_names = features
-        else:
-            importance = np.random.rand(len(features[:8]))
-            feature_names = features[:8]
-    except:
-        importance = np.random.rand(8)
-        feature_names = [f"Factor {i+1}" for i in range(8)]
-    
-    # Sort by importance
-    sorted_idx = np.argsort(importance)[-8:]
-    sorted_importance = importance[sorted_idx]
-    sorted_names = [feature_names[i] for i in sorted_idx]
-    
-    # Create horizontal bar chart with gaming theme
-    fig = go.Figure(data=[go.Bar(
-        x=sorted_importance,
-        y=sorted_names,
-        orientation='h',
-        marker_color='#4cc9f0',
-        marker_line_color='white',
-        marker_line_width=1,
-        text=[f"{val:.3f}" for val in sorted_importance],
-        textposition='auto',
-        textfont=dict(color='white', size=11)
-    )])
-    
-    fig.update_layout(
-        height=400,
-        title=dict(
-            text="IMPACT FACTORS ON SUCCESS",
-            font=dict(color='white', size=16)
-        ),
-        xaxis_title=dict(text="IMPORTANCE SCORE", font=dict(color='white')),
-        yaxis_title=dict(text="FACTORS", font=dict(color='white')),
-        template='plotly_dark',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=20, r=20, t=50, b=20),
-        font=dict(family='Arial, sans-serif')
-    )
-    
-    fig.update_xaxes(
-        gridcolor='rgba(76, 201, 240, 0.1)',
-        tickfont=dict(color='white')
-    )
-    
-    fig.update_yaxes(
-        gridcolor='rgba(76, 201, 240, 0.1)',
-        tickfont=dict(color='white')
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    # Built once per model
+    with timed("load_importance_figure"):
+        fig = load_importance_figure(model_path, model_version(model_path))
+
+    with timed("plotly_chart.importance"):
+        st.plotly_chart(fig, use_container_width=True)
     
     # Game Profile
     st.markdown("#### 🎮 GAME PROFILE")
@@ -696,8 +777,8 @@ with tab2:
             <div class="game-info-card">
                 <div style="font-size:0.9rem; color:#adb5bd !important; margin-bottom:0.3rem;">REVIEW VOLUME</div>
                 <div style="font-size:1.1rem; font-weight:bold; color:#4cc9f0 !important;">
-                    {"HIGH" if game['user_reviews'] > df['user_reviews'].quantile(0.75) 
-                    else "MEDIUM" if game['user_reviews'] > df['user_reviews'].quantile(0.25) 
+                    {"HIGH" if game['user_reviews'] > market.review_q75 
+                    else "MEDIUM" if game['user_reviews'] > market.review_q25 
                     else "LOW"}
                 </div>
             </div>
@@ -719,14 +800,65 @@ with tab2:
             <div class="game-info-card">
                 <div style="font-size:0.9rem; color:#adb5bd !important; margin-bottom:0.3rem;">MARKET POSITION</div>
                 <div style="font-size:1.1rem; font-weight:bold; color:#4cc9f0 !important;">
-                    {"TOP 25%" if game['user_reviews'] > df['user_reviews'].quantile(0.75) 
-                    else "TOP 50%" if game['user_reviews'] > df['user_reviews'].quantile(0.5) 
+                    {"TOP 25%" if game['user_reviews'] > market.review_q75 
+                    else "TOP 50%" if game['user_reviews'] > market.review_median 
                     else "BELOW AVG"}
                 </div>
             </div>
         """, unsafe_allow_html=True)
+    
+    render_scenarios()
+
+@fragment
+def render_scenarios():
+    st.markdown("#### 🧪 WHAT-IF SCENARIOS")
+    toggles = [t for t in PLATFORM_TOGGLES if t in features]
+    if "price_final" not in features or "discount" not in features:
+        st.caption("The current model does not use price and discount.")
+        return
+
+    scenario_col1, scenario_col2 = st.columns(2)
+    with scenario_col1:
+        price_max = max(60.0, float(game['price_final']) * 2)
+        price_range = st.slider("PRICE RANGE ($)", 0.0, price_max, (0.0, price_max), step=0.5)
+        price_steps = st.slider("PRICE STEPS", 5, 100, 50)
+    with scenario_col2:
+        discount_range = st.slider("DISCOUNT RANGE (%)", 0, 90, (0, 90), step=5)
+        discount_steps = st.slider("DISCOUNT STEPS", 2, 46, 19)
+    platforms = st.multiselect("TOGGLE PLATFORMS", toggles, default=toggles,
+                               help="Every on/off combination of these is scored")
+
+    try:
+        with timed("scenarios"):
+            combos, probability = load_scenarios(
+                model_path, model_version(model_path), data_version, game_pos,
+                (*price_range, price_steps), (*discount_range, discount_steps), tuple(platforms), game,
+            )
+    except Exception as e:
+        st.warning(f"Scenario sweep failed: {str(e)}")
+        return
+
+    labels = [" · ".join(f"{name.upper()} {'ON' if on else 'OFF'}" for name, on in combo.items()) or "AS IS"
+              for combo in combos]
+    # Default to the combination the game ships with today
+    current = next((i for i, combo in enumerate(combos)
+                    if all(bool(game[name]) == on for name, on in combo.items())), 0)
+    combo_pos = st.selectbox("PLATFORM SCENARIO", range(len(combos)), index=current,
+                             format_func=labels.__getitem__)
+    st.caption(f"{probability.size:,} scenarios scored · best in this view: "
+               f"{probability[combo_pos].max() * 100:.1f}% hit probability")
+
+    from charts import scenario_heatmap
+
+    with timed("figure.scenarios"):
+        fig = scenario_heatmap(
+            np.linspace(*price_range, price_steps), np.linspace(*discount_range, discount_steps),
+            probability[combo_pos], float(game['price_final']), float(game['discount']),
+        )
+    with timed("plotly_chart.scenarios"):
+        st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
+def render_insights():
     # Market Insights
     st.markdown("### 📊 MARKET INSIGHTS")
     
@@ -740,10 +872,10 @@ with tab3:
         price_stats = pd.DataFrame({
             "STATISTIC": ["AVERAGE", "MEDIAN", "MINIMUM", "MAXIMUM"],
             "VALUE": [
-                f"${df['price_final'].mean():.2f}",
-                f"${df['price_final'].median():.2f}",
-                f"${df['price_final'].min():.2f}",
-                f"${df['price_final'].max():.2f}"
+                f"${market.price_mean:.2f}",
+                f"${market.price_median:.2f}",
+                f"${market.price_min:.2f}",
+                f"${market.price_max:.2f}"
             ]
         })
         
@@ -760,7 +892,8 @@ with tab3:
         
         # Price percentile
         try:
-            price_percentile = (df['price_final'] < game['price_final']).mean() * 100
+            with timed("market.percentile"):
+                price_percentile = market.price_percentile(game['price_final'])
             st.metric(
                 "PRICE PERCENTILE", 
                 f"{price_percentile:.1f}%", 
@@ -776,10 +909,10 @@ with tab3:
         review_stats = pd.DataFrame({
             "STATISTIC": ["AVERAGE", "MEDIAN", "MINIMUM", "MAXIMUM"],
             "VALUE": [
-                f"{df['user_reviews'].mean():,.0f}",
-                f"{df['user_reviews'].median():,.0f}",
-                f"{df['user_reviews'].min():,.0f}",
-                f"{df['user_reviews'].max():,.0f}"
+                f"{market.review_mean:,.0f}",
+                f"{market.review_median:,.0f}",
+                f"{market.review_min:,.0f}",
+                f"{market.review_max:,.0f}"
             ]
         })
         
@@ -795,7 +928,8 @@ with tab3:
         
         # Review percentile
         try:
-            review_percentile = (df['user_reviews'] < game['user_reviews']).mean() * 100
+            with timed("market.percentile"):
+                review_percentile = market.review_percentile(game['user_reviews'])
             st.metric(
                 "REVIEW PERCENTILE", 
                 f"{review_percentile:.1f}%",
@@ -833,6 +967,216 @@ with tab3:
         except Exception as e:
             st.warning(f"Data display error: {str(e)}")
 
+# Charts above this many games get unreadable; the table still shows them all
+MAX_CHART_GAMES = 20
+MAX_TABLE_ROWS = 1000
+
+@fragment
+def render_compare():
+    st.markdown("### 🆚 GAME COMPARISON")
+    mode = st.radio("COMPARE:", ["PICKED GAMES", "COHORT"], horizontal=True, key="compare_mode")
+
+    if mode == "PICKED GAMES":
+        if "compare_games" not in st.session_state:
+            st.session_state["compare_games"] = [game_name]
+        query = st.text_input("ADD GAMES:", placeholder="Type a title...", key="compare_query")
+        with timed("search"):
+            matches = title_search.search(query)
+        # Picked titles stay selectable while the search results change
+        options = list(dict.fromkeys([*st.session_state["compare_games"], *matches]))
+        picked = st.multiselect("GAMES:", options, key="compare_games")
+        rows = np.array([title_index.position(title) for title in picked], dtype=np.int64)
+    else:
+        filter_col1, filter_col2, filter_col3 = st.columns(3)
+        with filter_col1:
+            platforms = st.multiselect("PLATFORMS:", PLATFORMS, format_func=PLATFORM_NAMES.get,
+                                       help="Games supporting all of these", key="cohort_platforms")
+        with filter_col2:
+            price_max = float(np.ceil(market.price_max))
+            price_range = st.slider("PRICE ($):", 0.0, price_max, (0.0, price_max), step=0.5, key="cohort_price")
+        with filter_col3:
+            min_rating = st.slider("MIN RATING (%):", 0, 100, 0, key="cohort_min_rating")
+        with timed("compare.filter"):
+            rows = cohort_rows(df, platforms, *price_range, min_rating)
+
+    if len(rows) == 0:
+        st.caption("No games to compare yet.")
+        return
+
+    # Whole cohort at once: batched lookups, one predict_proba for uncached rows
+    with timed("compare.metrics"):
+        batch, _ = scoring_model(model_path, int((rows >= len(predictions)).sum()))
+        proba = hit_probabilities(rows, predictions, batch, features, df)
+        table = compare(df, rows, market, proba)
+    st.caption(f"{len(table):,} game{'s' if len(table) != 1 else ''} · mean hit probability "
+               f"{table['hit_probability'].mean() * 100:.1f}% · {table['hit_probability'].sum():,.1f} expected hits")
+
+    if len(table) <= MAX_CHART_GAMES:
+        from charts import cohort_figure
+
+        with timed("figure.compare"):
+            fig = cohort_figure(table)
+        with timed("plotly_chart.compare"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    percent = dict(min_value=0, max_value=100, format="%.1f%%")
+    st.dataframe(
+        table.sort_values("hit_probability", ascending=False).head(MAX_TABLE_ROWS)
+             .assign(hit_probability=lambda t: t["hit_probability"] * 100),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "title": st.column_config.TextColumn("GAME TITLE", width="large"),
+            "price": st.column_config.NumberColumn("PRICE", format="$%.2f"),
+            "rating": st.column_config.NumberColumn("RATING", format="%d%%"),
+            "reviews": st.column_config.NumberColumn("REVIEWS", format="%d"),
+            "price_percentile": st.column_config.ProgressColumn("PRICE PCTL", **percent),
+            "review_percentile": st.column_config.ProgressColumn("REVIEW PCTL", **percent),
+            "review_rank": st.column_config.NumberColumn("REVIEW RANK", format="#%d"),
+            "hit_probability": st.column_config.ProgressColumn("HIT %", **percent),
+            "tier": st.column_config.TextColumn("TIER"),
+            "platforms": st.column_config.TextColumn("PLATFORMS"),
+        }
+    )
+    if len(table) > MAX_TABLE_ROWS:
+        st.caption(f"Showing the {MAX_TABLE_ROWS:,} games most likely to hit")
+
+    st.markdown("#### 🧮 COHORT BREAKDOWN")
+    group_by = st.radio("GROUP BY:", ["tier", "platforms"], horizontal=True,
+                        format_func={"tier": "PRICE TIER", "platforms": "PLATFORMS"}.get, key="compare_group_by")
+    with timed("compare.groupby"):
+        summary = summarize(table, group_by)
+    st.dataframe(
+        summary.assign(mean_hit_probability=summary["mean_hit_probability"] * 100),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            group_by: st.column_config.TextColumn("PRICE TIER" if group_by == "tier" else "PLATFORMS"),
+            "games": st.column_config.NumberColumn("GAMES", format="%d"),
+            "mean_hit_probability": st.column_config.ProgressColumn("MEAN HIT %", **percent),
+            "expected_hits": st.column_config.NumberColumn("EXPECTED HITS", format="%.1f"),
+            "median_price": st.column_config.NumberColumn("MEDIAN PRICE", format="$%.2f"),
+            "mean_rating": st.column_config.NumberColumn("MEAN RATING", format="%.1f%%"),
+            "median_reviews": st.column_config.NumberColumn("MEDIAN REVIEWS", format="%d"),
+        }
+    )
+
+EXPLORER_FLAGS = {"win": "WINDOWS", "mac": "macOS", "linux": "LINUX", "steam_deck": "STEAM DECK", "hit": "HIT GAME"}
+EXPLORER_COLUMNS = ["title", "price_final", "discount", "positive_ratio", "user_reviews",
+                    "win", "mac", "linux", "steam_deck"]
+
+@fragment
+def render_explorer():
+    st.markdown("### 🔎 CATALOG EXPLORER")
+    with timed("load_filter_index"):
+        index = load_filter_index(data_version, df)
+
+    # Explicit keys: the COMPARE tab has widgets with the same labels, and
+    # without lazy tabs both panels render in one run
+    flag_col, combine_col = st.columns([2, 1])
+    with flag_col:
+        flags = st.multiselect("HAS:", FLAGS, format_func=EXPLORER_FLAGS.get, key="explorer_flags")
+    with combine_col:
+        match_all = st.radio("COMBINE FILTERS:", ["ALL (AND)", "ANY (OR)"], horizontal=True,
+                             key="explorer_combine") == "ALL (AND)"
+
+    range_col1, range_col2 = st.columns(2)
+    price_max = float(np.ceil(market.price_max))
+    review_max = int(market.review_max)
+    with range_col1:
+        price = st.slider("PRICE ($):", 0.0, price_max, (0.0, price_max), step=0.5, key="explorer_price")
+        discount = st.slider("DISCOUNT (%):", 0, 100, (0, 100), key="explorer_discount")
+    with range_col2:
+        rating = st.slider("RATING (%):", 0, 100, (0, 100), key="explorer_rating")
+        reviews = st.slider("REVIEWS:", 0, review_max, (0, review_max), key="explorer_reviews")
+
+    bitmaps = [index.flag(name) for name in flags]
+    counts = [f"{EXPLORER_FLAGS[name]}: {index.count(index.flag(name)):,}" for name in flags]
+    # Only narrowed ranges are filters (a full range would match everything under OR)
+    for name, (low, high), full in (("price", price, (0.0, price_max)), ("discount", discount, (0, 100)),
+                                    ("rating", rating, (0, 100)), ("reviews", reviews, (0, review_max))):
+        if (low, high) == full:
+            continue
+        low = low if low > full[0] else None
+        high = high if high < full[1] else None
+        bitmaps.append(index.range(name, low, high))
+        counts.append(f"{name.upper()}: {index.range_count(name, low, high):,}")
+
+    with timed("explorer.query"):
+        bitmap = index.combine(bitmaps, match_all)
+        total = index.count(bitmap)
+
+    sort_col, order_col, size_col, page_col = st.columns(4)
+    with sort_col:
+        sort_by = st.selectbox("SORT BY:", ["reviews", "rating", "price", "discount"], format_func=str.upper,
+                               key="explorer_sort")
+    with order_col:
+        descending = st.radio("ORDER:", ["DESC", "ASC"], horizontal=True, key="explorer_order") == "DESC"
+    with size_col:
+        page_size = st.selectbox("PER PAGE:", [25, 50, 100], index=1, key="explorer_page_size")
+    pages = max(1, -(-total // page_size))
+    with page_col:
+        page = min(st.number_input("PAGE:", min_value=1, value=1, step=1, key="explorer_page"), pages) - 1
+
+    # Only this page's rows are looked up and sent to the browser
+    with timed("explorer.page"):
+        rows = index.page(bitmap, sort_by, descending, page, page_size)
+        page_frame = df.iloc[rows][EXPLORER_COLUMNS]
+    st.caption(f"{total:,} games match ({' · '.join(counts) or 'no filters'}) · page {page + 1} of {pages}")
+    st.dataframe(
+        page_frame,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "title": st.column_config.TextColumn("GAME TITLE", width="large"),
+            "price_final": st.column_config.NumberColumn("PRICE", format="$%.2f"),
+            "discount": st.column_config.NumberColumn("DISCOUNT", format="%d%%"),
+            "positive_ratio": st.column_config.NumberColumn("RATING", format="%d%%"),
+            "user_reviews": st.column_config.NumberColumn("REVIEWS", format="%d"),
+            "win": st.column_config.CheckboxColumn("WINDOWS"),
+            "mac": st.column_config.CheckboxColumn("MAC"),
+            "linux": st.column_config.CheckboxColumn("LINUX"),
+            "steam_deck": st.column_config.CheckboxColumn("DECK"),
+        }
+    )
+
+try:
+    # Lazy tabs: switching tabs reruns the script with only that panel open
+    tabs = st.tabs(["📊 DASHBOARD", "🎯 PREDICTOR", "📈 INSIGHTS", "🆚 COMPARE", "🔎 EXPLORER"], key="main_tab", on_change="rerun")
+except TypeError:
+    # Streamlit without lazy tabs renders every panel
+    tabs = st.tabs(["📊 DASHBOARD", "🎯 PREDICTOR", "📈 INSIGHTS", "🆚 COMPARE", "🔎 EXPLORER"])
+
+for tab, render in zip(tabs, [render_dashboard, render_predictor, render_insights, render_compare, render_explorer]):
+    # `open` is None when the tabs don't track which one is selected
+    if getattr(tab, "open", None) is not False:
+        with tab, timed(f"panel.{render.__name__[len('render_'):]}"):
+            render()
+
+# Hidden admin panel: open the app with ?admin=1 (or set SGR_ADMIN=1)
+if st.query_params.get("admin") == "1" or os.environ.get("SGR_ADMIN"):
+    with st.sidebar:
+        st.markdown("### ⏱️ TIMINGS")
+        st.markdown("---")
+        st.caption("Per-stage latency since startup (all sessions)")
+        st.dataframe(REGISTRY.stage_table(), use_container_width=True, hide_index=True)
+        st.caption("Cache hit rates")
+        st.dataframe(REGISTRY.cache_table(), use_container_width=True, hide_index=True)
+        if st.button("RESET TIMINGS"):
+            REGISTRY.reset()
+
+        manifest = read_manifest()
+        if manifest is not None:
+            st.markdown("### 🗂️ MODEL REGISTRY")
+            st.markdown("---")
+            current = manifest["versions"][manifest["current"]]
+            st.caption(f"Serving {manifest['current']} (trained {current['created_at']}, "
+                       f"accuracy {current['metrics'].get('accuracy', float('nan')):.4f})")
+            if manifest.get("previous"):
+                if st.button(f"ROLL BACK TO {manifest['previous']}"):
+                    rollback()
+                    st.rerun()
+
 # Gaming-themed Footer
 st.markdown("---")
 st.markdown(
@@ -851,4 +1195,6 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+finish_rerun()
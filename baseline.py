@@ -1,27 +1,27 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
+import argparse
+import time
+
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 from sklearn.tree import DecisionTreeClassifier
 
-# Load
-df = pd.read_csv("games.csv")
-
-# ✅ Target (label): Hit or Not
-df["hit"] = ((df["positive_ratio"] >= 85) & (df["user_reviews"] >= 500)).astype(int)
+from train import load_binned_split, load_split
 
-# ✅ Features (inputs)
-features = ["price_final", "discount", "win", "mac", "linux", "steam_deck", "user_reviews"]
-X = df[features]
-y = df["hit"]
+parser = argparse.ArgumentParser(description="Decision tree baseline.")
+parser.add_argument("--binned", action="store_true", help="train on the uint8 binned features (binning.py)")
+args = parser.parse_args()
 
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+# Load, label and split exactly like train.py (snapshot if fresh, else games.csv)
+if args.binned:
+    # Same rows, 1 byte per value
+    X_train, X_test, y_train, y_test, _ = load_binned_split()
+else:
+    X_train, X_test, y_train, y_test = load_split()
 
 # Decision Tree
 model = DecisionTreeClassifier(random_state=42)
+start = time.perf_counter()
 model.fit(X_train, y_train)
+print(f"✅ Fit time: {time.perf_counter() - start:.2f}s")
 
 # Predict
 y_pred = model.predict(X_test)
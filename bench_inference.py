@@ -0,0 +1,69 @@
+"""Parity check and latency benchmark: CompiledForest vs sklearn predict_proba.
+
+    python bench_inference.py [--repeat 50]
+
+Exits non-zero if the compiled forest's probabilities are not bit-identical
+to `model.predict_proba` on the catalog.
+"""
+import argparse
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from forest import compile_forest
+from registry import current_model, model_files
+from store import load_games
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def best_latency(fn, X, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=None, help="limit the parity check to the first N rows")
+    args = parser.parse_args()
+
+    model_file, features_file = model_files(current_model())
+    model = joblib.load(model_file)
+    features = joblib.load(features_file)
+    compiled = compile_forest(model, features)
+
+    X = load_games(features)[features].astype(np.float32)
+    if args.rows is not None:
+        X = X.iloc[:args.rows]
+
+    # Parity
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    mismatched = int((expected != actual).any(axis=1).sum())
+    if mismatched:
+        print(f"❌ Parity: {mismatched:,} of {len(X):,} rows differ "
+              f"(max abs diff {np.abs(expected - actual).max():.3g})")
+        sys.exit(1)
+    print(f"✅ Parity: {len(X):,} rows bit-identical to sklearn")
+
+    # Latency
+    print(f"\n{'batch':>7} {'sklearn ms':>11} {'compiled ms':>12} {'speedup':>8}")
+    for size in BATCH_SIZES:
+        if size > len(X):
+            break
+        batch = X.iloc[:size]
+        repeat = max(1, args.repeat if size <= 1000 else args.repeat // 10)
+        sk = best_latency(model.predict_proba, batch, repeat)
+        cf = best_latency(compiled.predict_proba, batch, repeat)
+        print(f"{size:>7} {sk * 1e3:>11.2f} {cf * 1e3:>12.2f} {sk / cf:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
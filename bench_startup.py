@@ -0,0 +1,170 @@
+"""Cold-start benchmark for app.py.
+
+Each measurement runs in a fresh interpreter, as a new Streamlit worker would:
+
+- `python -X importtime` over app.py's top-level imports: total import time,
+  the slowest packages, and which heavy packages (plotly, sklearn, joblib)
+  the app imports before the first render on top of streamlit's own imports;
+- a cold `AppTest` run of the app: time until the sidebar is painted (the
+  `until_sidebar` mark), time of the whole first run and of a warm rerun.
+
+    python bench_startup.py --output startup.json
+    python bench_startup.py --compare startup.json   # exit 1 on a regression
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+HEAVY = ("plotly", "sklearn", "joblib")
+
+RENDER = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+from instrument import REGISTRY
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+sidebar = REGISTRY.stages["until_sidebar"].last if "until_sidebar" in REGISTRY.stages else float("nan")
+start = time.perf_counter()
+at.run()
+print(json.dumps({
+    "until_sidebar_seconds": sidebar,
+    "first_run_seconds": first,
+    "warm_rerun_seconds": time.perf_counter() - start,
+    "exceptions": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def top_level_imports(app_path):
+    """Modules app.py imports at module level (deferred imports are skipped)."""
+    with open(app_path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(app_path):
+    """(total ms, {top-level package: cumulative ms}) of the app's top-level imports."""
+    code = "; ".join(f"import {m}" for m in top_level_imports(app_path))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True,
+                            text=True, cwd=os.path.dirname(os.path.abspath(app_path)), check=True)
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        # Only outermost imports: their cumulative time includes everything below
+        if not name.startswith("  "):
+            package = name.strip().split(".")[0]
+            packages[package] = packages.get(package, 0) + int(cumulative) / 1000
+    return sum(packages.values()), packages
+
+
+def _heavy_after(modules, cwd):
+    code = "; ".join(f"import {m}" for m in modules)
+    code += f"; import sys; print(','.join(p for p in {HEAVY!r} if p in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=cwd, check=True)
+    return [p for p in result.stdout.strip().split(",") if p]
+
+
+def loaded_heavy(app_path):
+    """Heavy packages the app's top-level imports load beyond what streamlit itself imports."""
+    cwd = os.path.dirname(os.path.abspath(app_path))
+    # streamlit imports plotly by itself when it is installed
+    baseline = _heavy_after(["streamlit"], cwd)
+    return [p for p in _heavy_after(top_level_imports(app_path), cwd) if p not in baseline]
+
+
+def render_times(app_path):
+    """One cold AppTest run in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-c", RENDER, os.path.basename(app_path)], capture_output=True,
+                            text=True, cwd=os.path.dirname(os.path.abspath(app_path)), check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(app_path, repeat):
+    """Median of `repeat` cold starts; returns the report dict."""
+    imports = [import_times(app_path) for _ in range(repeat)]
+    renders = [render_times(app_path) for _ in range(repeat)]
+    slowest = sorted(imports[0][1].items(), key=lambda item: item[1], reverse=True)[:10]
+    report = {
+        "app": app_path,
+        "python": sys.version.split()[0],
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "import_ms": float(np.median([total for total, _ in imports])),
+        "slowest_imports_ms": dict(slowest),
+        "heavy_at_import": loaded_heavy(app_path),
+        "exceptions": renders[0]["exceptions"],
+    }
+    for key in ("until_sidebar_seconds", "first_run_seconds", "warm_rerun_seconds"):
+        report[key] = float(np.median([r[key] for r in renders]))
+    return report
+
+
+def regressions(report, previous, max_slowdown):
+    found = []
+    for key in ("import_ms", "until_sidebar_seconds", "first_run_seconds", "warm_rerun_seconds"):
+        if previous.get(key, 0) > 0 and report[key] > previous[key] * max_slowdown:
+            found.append(f"{key} {previous[key]:.3f} -> {report[key]:.3f} ({report[key] / previous[key]:.1f}x)")
+    for package in report["heavy_at_import"]:
+        if package not in previous.get("heavy_at_import", []):
+            found.append(f"{package} is now imported before the first render")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app.py cold-start time.")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--repeat", type=int, default=3, help="cold starts per measurement (median)")
+    parser.add_argument("--output", default="startup.json")
+    parser.add_argument("--compare", default=None, help="earlier report to check for regressions")
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="allowed time ratio vs --compare")
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    report = run(args.app, args.repeat)
+    with open(args.output + ".tmp", "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(args.output + ".tmp", args.output)
+
+    print(f"✅ Top-level imports: {report['import_ms']:.0f} ms "
+          f"(heavy: {', '.join(report['heavy_at_import']) or 'none'})")
+    for package, ms in report["slowest_imports_ms"].items():
+        print(f"   {package:<20}{ms:>8.1f} ms")
+    print(f"✅ Sidebar painted after {report['until_sidebar_seconds']:.3f}s | first run "
+          f"{report['first_run_seconds']:.3f}s | warm rerun {report['warm_rerun_seconds']:.3f}s")
+    if report["exceptions"]:
+        print(f"❌ App raised: {report['exceptions']}")
+    print(f"✅ Saved {args.output}")
+
+    if previous is not None:
+        found = regressions(report, previous, args.max_slowdown)
+        for line in found:
+            print(f"❌ {line}")
+        if found:
+            sys.exit(1)
+        print(f"✅ No regressions vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Side-by-side benchmark of candidate models on the train.py split.
+
+The split is loaded once and written as .npy files that every worker process
+memory-maps, so candidates run in parallel without each re-loading the data.
+Per model the report records fit time, single-row and batch latency, peak
+memory growth, pickled size, accuracy and F1.
+
+    python benchmark.py --models decision_tree,random_forest,hist_gb --output benchmark.json
+    python benchmark.py --compare benchmark.json   # exit 1 on a regression
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from store import dataset_version
+from train import load_split, peak_rss_mb
+
+# Each candidate is single-threaded; the parallelism is across candidates
+CANDIDATES = {
+    "decision_tree": lambda: DecisionTreeClassifier(random_state=42),
+    "random_forest": lambda: RandomForestClassifier(n_estimators=300, random_state=42),
+    "random_forest_capped": lambda: RandomForestClassifier(
+        n_estimators=200, max_depth=12, max_leaf_nodes=256, random_state=42
+    ),
+    "hist_gb": lambda: HistGradientBoostingClassifier(random_state=42),
+    "sgd_logistic": lambda: make_pipeline(StandardScaler(), SGDClassifier(loss="log_loss", random_state=42)),
+}
+SPLIT = ("X_train", "X_test", "y_train", "y_test")
+# Single-row calls timed per model; the median is reported
+ROW_CALLS = 200
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def run_candidate(name, data_dir):
+    """Fit and measure one candidate in this (worker) process."""
+    X_train, X_test, y_train, y_test = (np.load(os.path.join(data_dir, f"{part}.npy"), mmap_mode="r")
+                                        for part in SPLIT)
+    model = CANDIDATES[name]()
+    # Peak RSS is a high-water mark: report the growth past imports and data loading
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    pred = model.predict(X_test)
+    row = np.ascontiguousarray(X_test[:1])
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return {
+        "model": name,
+        "fit_seconds": fit_seconds,
+        "row_latency_ms": _median_ms(lambda: model.predict_proba(row), ROW_CALLS),
+        "batch_latency_ms": _median_ms(lambda: model.predict_proba(X_test), 3),
+        "batch_rows": len(X_test),
+        "peak_rss_mb": peak_rss_mb() - baseline_rss,
+        "artifact_mb": buffer.getbuffer().nbytes / 1024 ** 2,
+        "accuracy": accuracy_score(y_test, pred),
+        "f1": f1_score(y_test, pred, zero_division=0),
+    }
+
+
+def run(models, workers):
+    """Benchmark `models` in parallel worker processes; returns the report dict."""
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as data_dir:
+        for part, values in zip(SPLIT, load_split()):
+            np.save(os.path.join(data_dir, f"{part}.npy"), np.ascontiguousarray(values))
+        # A fresh process per candidate keeps peak RSS per model; spawned, not
+        # forked, so it does not start out with the parent's memory counted
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 max_tasks_per_child=1) as pool:
+            results = list(pool.map(run_candidate, models, [data_dir] * len(models)))
+    return {
+        "dataset_version": dataset_version(),
+        "sklearn": sklearn.__version__,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def regressions(report, previous, max_accuracy_drop, max_slowdown):
+    """Human-readable regressions of `report` against an earlier report."""
+    before = {r["model"]: r for r in previous["results"]}
+    found = []
+    for result in report["results"]:
+        old = before.get(result["model"])
+        if old is None:
+            continue
+        name = result["model"]
+        if result["accuracy"] < old["accuracy"] - max_accuracy_drop:
+            found.append(f"{name}: accuracy {old['accuracy']:.4f} -> {result['accuracy']:.4f}")
+        for key in ("fit_seconds", "row_latency_ms", "batch_latency_ms"):
+            if old[key] > 0 and result[key] > old[key] * max_slowdown:
+                found.append(f"{name}: {key} {old[key]:.3f} -> {result[key]:.3f} ({result[key] / old[key]:.1f}x)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark candidate models on the shared split.")
+    parser.add_argument("--models", default=",".join(CANDIDATES),
+                        help=f"comma-separated subset of: {', '.join(CANDIDATES)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parallel worker processes")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", default=None, help="earlier report to check for regressions")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01)
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="allowed time ratio vs --compare")
+    args = parser.parse_args()
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    unknown = [m for m in models if m not in CANDIDATES]
+    if unknown:
+        parser.error(f"unknown models: {unknown}")
+    # Read before the new report can overwrite it
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    report = run(models, min(args.workers, len(models)))
+    with open(args.output + ".tmp", "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(args.output + ".tmp", args.output)
+
+    print(f"{'model':<22}{'fit s':>8}{'row ms':>9}{'batch ms':>10}{'+RSS MB':>8}{'size MB':>9}{'acc':>8}{'F1':>7}")
+    for r in report["results"]:
+        print(f"{r['model']:<22}{r['fit_seconds']:>8.2f}{r['row_latency_ms']:>9.3f}{r['batch_latency_ms']:>10.1f}"
+              f"{r['peak_rss_mb']:>8.0f}{r['artifact_mb']:>9.2f}{r['accuracy']:>8.4f}{r['f1']:>7.3f}")
+    print(f"✅ Saved {args.output}")
+
+    if previous is not None:
+        found = regressions(report, previous, args.max_accuracy_drop, args.max_slowdown)
+        for line in found:
+            print(f"❌ {line}")
+        if found:
+            sys.exit(1)
+        print(f"✅ No regressions vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
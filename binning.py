@@ -0,0 +1,109 @@
+"""Quantile-binned uint8 copy of the model features.
+
+`python binning.py` computes bin edges once per dataset version and stores the
+features as a (n_rows, n_features) uint8 matrix next to the snapshot, so
+training reads 1 byte per value instead of re-sorting raw float columns.
+Columns with few distinct values (discount, the platform flags) get one bin
+per value; the rest get up to 254 quantile bins.  NaN maps to bin 255.
+
+`Binner` applies the same edges at inference time, so a model trained on the
+bins is saved as Pipeline([Binner, model]) and still takes raw features.
+"""
+import json
+import os
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from store import STORE_DIR, _save_array, _write_json, dataset_version, iter_games, load_games
+
+MAX_BINS = 254
+MISSING_BIN = 255
+BINNED_FILE = "binned.npy"
+EDGES_FILE = "bin_edges.json"
+
+
+def compute_edges(values, max_bins=MAX_BINS):
+    """Bin edges for one column: midpoints between values or quantile cuts."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    distinct = np.unique(values)
+    if len(distinct) <= max_bins:
+        return (distinct[:-1] + distinct[1:]) / 2
+    return np.unique(np.quantile(values, np.linspace(0, 1, max_bins + 1)[1:-1]))
+
+
+def apply_edges(X, edges):
+    """uint8 bin ids of a float matrix, one edge array per column."""
+    X = np.asarray(X, dtype=np.float64)
+    binned = np.empty(X.shape, dtype=np.uint8)
+    for i, column_edges in enumerate(edges):
+        column = X[:, i]
+        binned[:, i] = np.searchsorted(column_edges, column, side="right")
+        binned[np.isnan(column), i] = MISSING_BIN
+    return binned
+
+
+class Binner(BaseEstimator, TransformerMixin):
+    """Maps raw feature values to the uint8 bins a model was trained on."""
+
+    def __init__(self, features=None, edges=None):
+        self.features = features
+        self.edges = edges
+
+    def fit(self, X, y=None):
+        if hasattr(X, "columns"):
+            self.features = list(X.columns)
+        X = np.asarray(X, dtype=np.float64)
+        self.edges = [compute_edges(X[:, i]) for i in range(X.shape[1])]
+        return self
+
+    def transform(self, X):
+        if hasattr(X, "columns") and self.features is not None:
+            X = X[self.features]
+        return apply_edges(X, self.edges)
+
+
+def build_bins(features, chunksize=100_000, store_dir=STORE_DIR):
+    """Compute edges over the whole catalog and write the binned matrix."""
+    version = dataset_version()
+    df = load_games(features)
+    edges = [compute_edges(df[name].to_numpy()) for name in features]
+    binned = np.empty((len(df), len(features)), dtype=np.uint8)
+    del df
+    start = 0
+    for chunk in iter_games(features, chunksize=chunksize):
+        binned[start:start + len(chunk)] = apply_edges(chunk[features], edges)
+        start += len(chunk)
+
+    os.makedirs(store_dir, exist_ok=True)
+    _save_array(os.path.join(store_dir, BINNED_FILE), binned)
+    _write_json(os.path.join(store_dir, EDGES_FILE), {
+        "dataset_version": version,
+        "features": list(features),
+        "edges": [e.tolist() for e in edges],
+    })
+    return binned, Binner(list(features), edges)
+
+
+def load_bins(features, store_dir=STORE_DIR):
+    """(memory-mapped uint8 matrix, Binner) for the current data, building on a miss."""
+    try:
+        with open(os.path.join(store_dir, EDGES_FILE)) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        meta = None
+    if meta is None or meta["dataset_version"] != dataset_version() or meta["features"] != list(features):
+        return build_bins(features, store_dir=store_dir)
+    binned = np.load(os.path.join(store_dir, BINNED_FILE), mmap_mode="r")
+    return binned, Binner(meta["features"], [np.asarray(e) for e in meta["edges"]])
+
+
+if __name__ == "__main__":
+    import joblib
+
+    features = joblib.load("features.pkl")
+    binned, binner = build_bins(features)
+    print(f"✅ Binned {binned.shape[0]:,} rows x {binned.shape[1]} features "
+          f"({binned.nbytes / 1024 ** 2:.1f} MB, bins per feature: {[len(e) + 1 for e in binner.edges]})")
+    print(f"✅ Saved {os.path.join(STORE_DIR, BINNED_FILE)}")
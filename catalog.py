@@ -0,0 +1,185 @@
+"""Lookup structures derived from the games table, built once per dataset version."""
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from store import changed_rows, dataset_version, load_games, snapshot_version
+
+
+class TitleIndex:
+    """Title -> row position map plus the unique titles for the game selector.
+
+    Duplicate titles resolve to their first row in dataset order, which is what
+    `df[df["title"] == name].iloc[0]` used to return.
+    """
+
+    def __init__(self, titles):
+        codes, uniques = pd.factorize(np.asarray(titles, dtype=object))
+        valid = codes >= 0
+        _, first = np.unique(codes[valid], return_index=True)
+        first = np.flatnonzero(valid)[first]
+        self._set(np.asarray(uniques, dtype=object), first)
+
+    def _set(self, titles, rows):
+        self.titles = titles
+        self.rows = rows
+        self._positions = dict(zip(titles, rows.tolist()))
+
+    def updated(self, previous_titles, titles, rows):
+        """Index after the rows in `rows` of `previous_titles` changed or were appended.
+
+        Appended rows only add titles not seen before; a renamed existing row
+        can move another title's first occurrence, so that rebuilds the index.
+        """
+        previous_titles = np.asarray(previous_titles, dtype=object)
+        titles = np.asarray(titles, dtype=object)
+        rows = np.asarray(rows)
+        n_before = len(previous_titles)
+        old_rows = rows[rows < n_before]
+        if not pd.Series(previous_titles[old_rows]).equals(pd.Series(titles[old_rows])):
+            return TitleIndex(titles)
+
+        added = TitleIndex(titles[n_before:])
+        new = np.array([t not in self._positions for t in added.titles], dtype=bool)
+        index = TitleIndex.__new__(TitleIndex)
+        index._set(
+            np.concatenate([self.titles, added.titles[new]]),
+            np.concatenate([self.rows, added.rows[new] + n_before]),
+        )
+        return index
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, title):
+        return title in self._positions
+
+    def position(self, title):
+        """Row position of `title`; raises KeyError for unknown titles."""
+        return self._positions[title]
+
+
+def _sorted_values(series):
+    values = np.sort(series.to_numpy(dtype="float64"))
+    return values[~np.isnan(values)]
+
+
+def _replace_sorted(values, removed, added):
+    # Drop one occurrence of each removed value and merge in the added ones,
+    # without re-sorting the whole column
+    removed = _sorted_values(removed)
+    duplicate = np.arange(len(removed)) - np.searchsorted(removed, removed, side="left")
+    values = np.delete(values, np.searchsorted(values, removed, side="left") + duplicate)
+    added = _sorted_values(added)
+    return np.insert(values, np.searchsorted(values, added, side="left"), added)
+
+
+class MarketStats:
+    """Aggregates and sorted columns for market comparisons.
+
+    Ranks and percentiles are `searchsorted` lookups, so they accept a scalar
+    or an array of values and never rescan the table.
+    """
+
+    def __init__(self, df):
+        ratings = df["positive_ratio"]
+        self._set(
+            len(df), _sorted_values(df["user_reviews"]), _sorted_values(df["price_final"]),
+            float(ratings.sum()), int(ratings.count()),
+        )
+
+    def _set(self, n_rows, reviews, prices, rating_sum, rating_count):
+        self.n_rows = n_rows
+        self.reviews = reviews
+        self.prices = prices
+        self.rating_sum = rating_sum
+        self.rating_count = rating_count
+        self.rating_mean = rating_sum / rating_count if rating_count else float("nan")
+
+        self.price_mean = float(self.prices.mean())
+        self.price_median = float(np.median(self.prices))
+        self.price_min = float(self.prices[0])
+        self.price_max = float(self.prices[-1])
+
+        self.review_mean = float(self.reviews.mean())
+        self.review_min = float(self.reviews[0])
+        self.review_max = float(self.reviews[-1])
+        self.review_q25, self.review_median, self.review_q75 = (
+            float(q) for q in np.quantile(self.reviews, [0.25, 0.5, 0.75])
+        )
+
+    def updated(self, removed, added, n_rows):
+        """Stats after the rows in `removed` were replaced by those in `added`.
+
+        `removed` holds the old values of updated rows, `added` the new values
+        of updated and appended rows; only those rows are touched.
+        """
+        stats = MarketStats.__new__(MarketStats)
+        stats._set(
+            n_rows,
+            _replace_sorted(self.reviews, removed["user_reviews"], added["user_reviews"]),
+            _replace_sorted(self.prices, removed["price_final"], added["price_final"]),
+            self.rating_sum - float(removed["positive_ratio"].sum()) + float(added["positive_ratio"].sum()),
+            self.rating_count - int(removed["positive_ratio"].count()) + int(added["positive_ratio"].count()),
+        )
+        return stats
+
+    def review_rank(self, reviews):
+        """1-based rank by review count (1 + games with strictly more reviews)."""
+        return len(self.reviews) - np.searchsorted(self.reviews, reviews, side="right") + 1
+
+    def review_percentile(self, reviews):
+        """Percentage of games with fewer reviews."""
+        return np.searchsorted(self.reviews, reviews, side="left") / self.n_rows * 100
+
+    def price_percentile(self, price):
+        """Percentage of games cheaper than `price`."""
+        return np.searchsorted(self.prices, price, side="left") / self.n_rows * 100
+
+
+CatalogState = namedtuple("CatalogState", ["version", "store_version", "df", "titles", "market"])
+
+
+class Catalog:
+    """The games table with its TitleIndex and MarketStats, kept in step with the store.
+
+    `refresh()` is a manifest check while nothing changed.  When the store
+    logged which rows a delta touched (see ingest.py), the new table is mapped
+    and only those rows are folded into the title index and market stats.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._state = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Current CatalogState; one consistent (version, df, titles, market) tuple."""
+        version = dataset_version()
+        state = self._state
+        if state is not None and state.version == version:
+            return state
+        with self._lock:
+            if self._state is None or self._state.version != version:
+                self._state = self._load(version, self._state)
+            return self._state
+
+    def _load(self, version, previous):
+        # Read the store version before the data, so a delta landing in
+        # between is re-applied (harmlessly) rather than missed
+        store_version = snapshot_version()
+        df = load_games(self.columns)
+        rows = changed_rows(previous.store_version) if previous is not None else None
+        if rows is None:
+            return CatalogState(version, store_version, df, TitleIndex(df["title"]), MarketStats(df))
+
+        old = previous.df
+        rows = rows[rows < len(df)]
+        removed = old.iloc[rows[rows < len(old)]]
+        return CatalogState(
+            version, store_version, df,
+            previous.titles.updated(old["title"], df["title"], rows),
+            previous.market.updated(removed, df.iloc[rows], len(df)),
+        )
@@ -0,0 +1,181 @@
+"""Plotly figures for the dashboard, split into cached and per-game parts.
+
+The feature-importance chart only depends on the model and the MARKET AVG
+comparison only on the dataset, so app.py builds both once per version.  Per
+selected game only the SELECTED GAME bar changes: it is a plain dict copied
+from the validated base trace, and the figure is assembled with
+`_validate=False`, so plotly does not re-validate the (large) dark template.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+GAME_COLOR = '#4cc9f0'
+MARKET_COLOR = '#9d4edd'
+CATEGORIES = ['PRICE', 'RATING', 'REVIEWS']
+AXIS_STYLE = dict(gridcolor='rgba(76, 201, 240, 0.1)', tickfont=dict(color='white'))
+
+
+def _comparison_bar(name, color, values, text):
+    return go.Bar(
+        name=name,
+        x=CATEGORIES,
+        y=values,
+        marker_color=color,
+        marker_line_color='white',
+        marker_line_width=1,
+        text=text,
+        textposition='outside',
+        textfont=dict(color='white', size=12)
+    )
+
+
+def market_base(market):
+    """Validated comparison chart as a dict; the game bar is a placeholder."""
+    fig = go.Figure()
+    fig.add_trace(_comparison_bar('SELECTED GAME', GAME_COLOR, [0, 0, 0], ['', '', '']))
+    fig.add_trace(_comparison_bar(
+        'MARKET AVG', MARKET_COLOR,
+        [market.price_mean, market.rating_mean, min(market.review_mean / 1000, 100)],
+        [f"${market.price_mean:.2f}", f"{market.rating_mean:.1f}%", f"{int(market.review_mean):,}"],
+    ))
+    fig.update_layout(
+        height=350,
+        barmode='group',
+        showlegend=True,
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=40, b=20),
+        font=dict(color='white', family='Arial, sans-serif'),
+        legend=dict(
+            bgcolor='rgba(26, 31, 46, 0.8)',
+            bordercolor='rgba(76, 201, 240, 0.3)',
+            borderwidth=1
+        )
+    )
+    fig.update_xaxes(**AXIS_STYLE)
+    fig.update_yaxes(**AXIS_STYLE)
+    return fig.to_dict()
+
+
+def market_figure(base, game):
+    """The cached comparison base with `game`'s values filled in."""
+    # Shallow copies only: the cached base is shared between sessions
+    game_bar = dict(
+        base['data'][0],
+        y=[float(game['price_final']), float(game['positive_ratio']), min(float(game['user_reviews']) / 1000, 100)],
+        text=[f"${float(game['price_final']):.2f}", f"{float(game['positive_ratio'])}%", f"{int(game['user_reviews']):,}"],
+    )
+    return go.Figure({'data': [game_bar] + base['data'][1:], 'layout': base['layout']}, _validate=False)
+
+
+def importance_figure(importance, feature_names):
+    """Horizontal bar chart of the 8 most important features."""
+    importance = np.asarray(importance)
+    sorted_idx = np.argsort(importance)[-8:]
+    sorted_importance = importance[sorted_idx]
+    sorted_names = [feature_names[i] for i in sorted_idx]
+
+    fig = go.Figure(data=[go.Bar(
+        x=sorted_importance,
+        y=sorted_names,
+        orientation='h',
+        marker_color='#4cc9f0',
+        marker_line_color='white',
+        marker_line_width=1,
+        text=[f"{val:.3f}" for val in sorted_importance],
+        textposition='auto',
+        textfont=dict(color='white', size=11)
+    )])
+    fig.update_layout(
+        height=400,
+        title=dict(
+            text="IMPACT FACTORS ON SUCCESS",
+            font=dict(color='white', size=16)
+        ),
+        xaxis_title=dict(text="IMPORTANCE SCORE", font=dict(color='white')),
+        yaxis_title=dict(text="FACTORS", font=dict(color='white')),
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=50, b=20),
+        font=dict(family='Arial, sans-serif')
+    )
+    fig.update_xaxes(**AXIS_STYLE)
+    fig.update_yaxes(**AXIS_STYLE)
+    return fig
+
+
+def scenario_heatmap(prices, discounts, probability, current_price=None, current_discount=None):
+    """Hit probability (%) over a discount x price grid, with the game's current point."""
+    fig = go.Figure(data=[go.Heatmap(
+        x=prices,
+        y=discounts,
+        z=np.asarray(probability) * 100,
+        zmin=0,
+        zmax=100,
+        colorscale=[[0, '#ff0054'], [0.5, '#ffbe0b'], [1, '#4cc9f0']],
+        colorbar=dict(title=dict(text="HIT %", font=dict(color='white')), tickfont=dict(color='white')),
+        hovertemplate="$%{x:.2f} · %{y:.0f}% off<br>%{z:.1f}% hit probability<extra></extra>"
+    )])
+    if current_price is not None:
+        fig.add_trace(go.Scatter(
+            x=[current_price],
+            y=[current_discount],
+            mode='markers',
+            name='CURRENT',
+            marker=dict(symbol='x', size=12, color='white', line=dict(color='black', width=1)),
+            hovertemplate="CURRENT: $%{x:.2f} · %{y:.0f}% off<extra></extra>"
+        ))
+    fig.update_layout(
+        height=420,
+        xaxis_title=dict(text="PRICE ($)", font=dict(color='white')),
+        yaxis_title=dict(text="DISCOUNT (%)", font=dict(color='white')),
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=30, b=20),
+        showlegend=False,
+        font=dict(family='Arial, sans-serif')
+    )
+    fig.update_xaxes(**AXIS_STYLE)
+    fig.update_yaxes(**AXIS_STYLE)
+    return fig
+
+
+def cohort_figure(table):
+    """Price/review percentile and hit probability per game, grouped by game."""
+    titles = [str(title) for title in table['title']]
+    fig = go.Figure()
+    for name, values, color in (
+        ('PRICE PCTL', table['price_percentile'], GAME_COLOR),
+        ('REVIEW PCTL', table['review_percentile'], MARKET_COLOR),
+        ('HIT %', table['hit_probability'] * 100, '#ffbe0b'),
+    ):
+        fig.add_trace(go.Bar(
+            name=name,
+            x=titles,
+            y=values,
+            marker_color=color,
+            marker_line_color='white',
+            marker_line_width=1,
+            hovertemplate="%{x}<br>" + name + ": %{y:.1f}<extra></extra>"
+        ))
+    fig.update_layout(
+        height=380,
+        barmode='group',
+        yaxis_range=[0, 100],
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=40, b=20),
+        font=dict(color='white', family='Arial, sans-serif'),
+        legend=dict(
+            bgcolor='rgba(26, 31, 46, 0.8)',
+            bordercolor='rgba(76, 201, 240, 0.3)',
+            borderwidth=1
+        )
+    )
+    fig.update_xaxes(**AXIS_STYLE)
+    fig.update_yaxes(**AXIS_STYLE)
+    return fig
@@ -0,0 +1,96 @@
+"""Side-by-side analytics for many games at once.
+
+A cohort is a set of catalog rows: hand-picked games, or a filter such as
+"Linux + Steam Deck, under $20" evaluated as one boolean mask over the
+columns.  Every metric is computed for the whole cohort in one call:
+
+- percentiles and ranks are batched `searchsorted` lookups against the
+  sorted columns of `MarketStats` (catalog.py);
+- hit probabilities come from the prediction cache, and rows it does not
+  cover yet are scored with a single `predict_proba` batch;
+- cohort summaries are one groupby over price tier or platform support.
+"""
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ["win", "mac", "linux", "steam_deck"]
+PLATFORM_NAMES = {"win": "WIN", "mac": "MAC", "linux": "LINUX", "steam_deck": "DECK"}
+# Same thresholds as the GAME PROFILE card in app.py
+PRICE_TIERS = ["BUDGET", "MID-RANGE", "PREMIUM"]
+PRICE_TIER_EDGES = [5, 20]
+
+
+def cohort_rows(df, platforms=(), min_price=None, max_price=None, min_rating=None):
+    """Row positions of the games matching every given filter."""
+    mask = np.ones(len(df), dtype=bool)
+    for name in platforms:
+        mask &= df[name].to_numpy(dtype=bool)
+    price = df["price_final"].to_numpy()
+    if min_price is not None:
+        mask &= price >= min_price
+    if max_price is not None:
+        mask &= price <= max_price
+    if min_rating is not None:
+        mask &= df["positive_ratio"].to_numpy() >= min_rating
+    return np.flatnonzero(mask)
+
+
+def hit_probabilities(rows, predictions, model, features, df):
+    """Hit probability per row: cached where possible, the rest in one batch."""
+    rows = np.asarray(rows, dtype=np.int64)
+    proba = np.empty(len(rows), dtype=np.float64)
+    cached = rows < len(predictions)
+    proba[cached] = predictions[rows[cached], 1]
+    if not cached.all():
+        # Named columns: sklearn checks them against the names it was fitted with
+        X = df[features].iloc[rows[~cached]].astype(np.float32)
+        proba[~cached] = model.predict_proba(X)[:, 1]
+    return proba
+
+
+def price_tiers(prices):
+    """PRICE_TIERS label per price."""
+    codes = np.searchsorted(PRICE_TIER_EDGES, prices, side="left")
+    return pd.Categorical.from_codes(codes, PRICE_TIERS)
+
+
+def platform_labels(df, rows):
+    """Supported platforms per row, e.g. "WIN+LINUX+DECK"."""
+    bits = np.zeros(len(rows), dtype=np.int64)
+    for i, name in enumerate(PLATFORMS):
+        bits |= df[name].to_numpy(dtype=bool)[rows].astype(np.int64) << i
+    # One label per bit pattern, looked up for every row at once
+    labels = ["+".join(PLATFORM_NAMES[name] for i, name in enumerate(PLATFORMS) if code >> i & 1) or "NONE"
+              for code in range(1 << len(PLATFORMS))]
+    return pd.Categorical.from_codes(bits, labels)
+
+
+def compare(df, rows, market, proba):
+    """One row per game with its market percentiles, review rank and hit probability."""
+    rows = np.asarray(rows, dtype=np.int64)
+    prices = df["price_final"].to_numpy()[rows]
+    reviews = df["user_reviews"].to_numpy()[rows]
+    return pd.DataFrame({
+        "title": df["title"].to_numpy()[rows],
+        "price": prices,
+        "rating": df["positive_ratio"].to_numpy()[rows],
+        "reviews": reviews,
+        "price_percentile": market.price_percentile(prices),
+        "review_percentile": market.review_percentile(reviews),
+        "review_rank": market.review_rank(reviews),
+        "hit_probability": proba,
+        "tier": price_tiers(prices),
+        "platforms": platform_labels(df, rows),
+    }, index=rows)
+
+
+def summarize(table, by="tier"):
+    """Per-cohort aggregates of a `compare()` table."""
+    return table.groupby(by, observed=True).agg(
+        games=("title", "size"),
+        mean_hit_probability=("hit_probability", "mean"),
+        expected_hits=("hit_probability", "sum"),
+        median_price=("price", "median"),
+        mean_rating=("rating", "mean"),
+        median_reviews=("reviews", "median"),
+    ).reset_index()
@@ -0,0 +1,37 @@
+"""Shared pytest fixtures: a small synthetic games.csv in a scratch directory.
+
+The scripts read games.csv, games_store/, model.pkl and models/ relative to
+the working directory, so each test runs inside its own tmp_path.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_games(n_rows=400, seed=0, first_id=10):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "app_id": np.arange(first_id, first_id + n_rows) * 10,
+        "title": [f"Game {word} {i}" for i, word in
+                  enumerate(rng.choice(["Quest", "Space", "Farm", "Racer"], n_rows))],
+        "date_release": "2020-01-01",
+        "win": rng.random(n_rows) < 0.9,
+        "mac": rng.random(n_rows) < 0.3,
+        "linux": rng.random(n_rows) < 0.2,
+        "rating": rng.choice(["Positive", "Mixed"], n_rows),
+        "positive_ratio": rng.integers(20, 100, n_rows),
+        "user_reviews": (rng.pareto(1.2, n_rows) * 100).astype(int) + 10,
+        "price_final": rng.choice([0.0, 4.99, 9.99, 19.99, 59.99], n_rows),
+        "price_original": 0.0,
+        "discount": rng.choice([0, 0, 10, 50], n_rows),
+        "steam_deck": rng.random(n_rows) < 0.5,
+    })
+
+
+@pytest.fixture
+def games(tmp_path, monkeypatch):
+    """games.csv written to a fresh working directory; returns the frame."""
+    monkeypatch.chdir(tmp_path)
+    df = make_games()
+    df.to_csv("games.csv", index=False)
+    return df
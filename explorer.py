@@ -0,0 +1,113 @@
+"""Bitmap and range indexes for filtering the catalog.
+
+Built once per dataset version (app.py caches it):
+
+- a packed bitmap (`np.packbits`, 1 bit per game) for each boolean column:
+  win, mac, linux, steam_deck and the derived `hit` label;
+- a sorted range index for price, discount, rating and reviews: the sorted
+  values (a range's match count is two `searchsorted` calls) plus every
+  row's rank in that order (pages are ordered by rank).  Range bitmaps are
+  one comparison pass over the column and are cached, so a rerun that only
+  turns the page or toggles a flag reuses them.
+
+Filters combine as bitwise AND / OR over n/8 bytes.  Results are read one
+page at a time: matching rows come from the non-zero bytes only and are
+ordered by rank with `argpartition`, so a query never sorts the catalog and
+never ships more than a page to the browser.
+"""
+import functools
+
+import numpy as np
+
+FLAGS = ["win", "mac", "linux", "steam_deck", "hit"]
+RANGES = {"price": "price_final", "discount": "discount", "rating": "positive_ratio", "reviews": "user_reviews"}
+# Set bits per byte value, for NumPy versions without np.bitwise_count
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _frozen(bitmap):
+    # Bitmaps are shared by every session
+    bitmap.flags.writeable = False
+    return bitmap
+
+
+class FilterIndex:
+    """Bitmaps for the FLAGS and sorted range indexes for the RANGES of one catalog table."""
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        columns = {name: df[name].to_numpy(dtype=bool) for name in FLAGS[:-1]}
+        # Same rule as train.hit_labels (not imported: train.py pulls in sklearn)
+        columns["hit"] = (df["positive_ratio"].to_numpy() >= 85) & (df["user_reviews"].to_numpy() >= 500)
+        self.bitmaps = {name: _frozen(np.packbits(values)) for name, values in columns.items()}
+
+        rank_dtype = np.int32 if self.n_rows < 2 ** 31 else np.int64
+        self.values = {}
+        self.sorted_values = {}
+        self.ranks = {}
+        for name, column in RANGES.items():
+            values = self.values[name] = df[column].to_numpy()
+            order = np.argsort(values, kind="stable")
+            self.sorted_values[name] = values[order]
+            ranks = np.empty(self.n_rows, dtype=rank_dtype)
+            ranks[order] = np.arange(self.n_rows, dtype=rank_dtype)
+            self.ranks[name] = ranks
+        # Thread-safe per-index cache of range bitmaps
+        self.range = functools.lru_cache(maxsize=64)(self._range)
+
+    def everything(self):
+        return np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def flag(self, name):
+        """Bitmap of the games where `name` is true."""
+        return self.bitmaps[name]
+
+    def _range(self, name, low=None, high=None):
+        """Bitmap of the games with low <= value <= high (either bound optional)."""
+        values = self.values[name]
+        mask = np.ones(self.n_rows, dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return _frozen(np.packbits(mask))
+
+    def range_count(self, name, low=None, high=None):
+        """Number of games in a range, without building its bitmap."""
+        values = self.sorted_values[name]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        # An inverted range (low > high) matches nothing
+        return max(int(stop - start), 0)
+
+    def combine(self, bitmaps, match_all=True):
+        """AND (match_all) or OR of bitmaps; no bitmaps matches every game."""
+        if not bitmaps:
+            return self.everything()
+        op = np.bitwise_and if match_all else np.bitwise_or
+        return op.reduce(bitmaps)
+
+    def count(self, bitmap):
+        if hasattr(np, "bitwise_count"):
+            return int(np.bitwise_count(bitmap).sum(dtype=np.int64))
+        return int(POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def rows(self, bitmap):
+        """Row positions of the set bits, ascending."""
+        nonzero = np.flatnonzero(bitmap)
+        bits = np.unpackbits(bitmap[nonzero][:, None], axis=1).view(bool)
+        return (nonzero[:, None] * 8 + np.arange(8))[bits]
+
+    def page(self, bitmap, sort_by="reviews", descending=True, page=0, page_size=50):
+        """Row positions on one page of the matches, ordered by a range index."""
+        rows = self.rows(bitmap)
+        stop = min((page + 1) * page_size, len(rows))
+        if page * page_size >= stop:
+            return rows[:0]
+        keys = self.ranks[sort_by][rows].astype(np.int64)
+        if descending:
+            keys = -keys
+        # Only the first `stop` matches need ordering
+        first = np.argpartition(keys, stop - 1)[:stop] if stop < len(rows) else np.arange(len(rows))
+        first = first[np.argsort(keys[first])]
+        return rows[first[page * page_size:]]
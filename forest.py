@@ -0,0 +1,235 @@
+"""Flat, memory-mappable artifact and NumPy inference engine for the RandomForest.
+
+`save_forest()` stores every tree's node arrays stacked end to end in a single
+versioned file, with the feature list, classes, feature importances and
+training metadata in a JSON header.  `load_forest()` only parses the header and
+maps the arrays, so Streamlit workers share the same page-cache pages instead of
+each unpickling a private copy of the forest.  `compile_forest()` builds the
+same structure in memory straight from model.pkl.
+
+Layout: MAGIC | uint64 header length | JSON header | 64-byte aligned arrays.
+"""
+import json
+import os
+import re
+import struct
+
+import numpy as np
+
+FOREST_PATH = "model.forest"
+MAGIC = b"SGFOREST"
+FORMAT_VERSION = 2
+ALIGN = 64
+TREE_LEAF = -1
+
+
+def _float32_floor(threshold):
+    # Largest float32 <= threshold: for float32 inputs `x <= t` and
+    # `x <= floor32(t)` agree exactly, so the narrower dtype is lossless
+    narrowed = threshold.astype(np.float32)
+    above = narrowed.astype(np.float64) > threshold
+    narrowed[above] = np.nextafter(narrowed[above], np.float32(-np.inf))
+    return narrowed
+
+
+def _stores_class_counts():
+    # Before scikit-learn 1.4, tree_.value held weighted class counts that
+    # predict_proba divided by their sum; since 1.4 it holds the fractions
+    # and predict_proba returns them as is (re-dividing changes the last bit)
+    import sklearn
+
+    return tuple(int(part) for part in re.match(r"(\d+)\.(\d+)", sklearn.__version__).groups()) < (1, 4)
+
+
+def compile_arrays(model, quantize=False):
+    """Stack the node arrays of every tree in a fitted RandomForestClassifier.
+
+    Node ids are global across trees, and both children of a leaf point back
+    at the leaf itself, so extra traversal steps past a leaf are no-ops.
+    """
+    trees = [est.tree_ for est in model.estimators_]
+    offsets = np.zeros(len(trees) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([t.node_count for t in trees])
+
+    left = np.concatenate([t.children_left for t in trees])
+    right = np.concatenate([t.children_right for t in trees])
+    tree_offset = np.repeat(offsets[:-1], [t.node_count for t in trees])
+    leaf = left == TREE_LEAF
+    node_ids = np.arange(offsets[-1])
+    children = np.stack([
+        np.where(leaf, node_ids, left + tree_offset),
+        np.where(leaf, node_ids, right + tree_offset),
+    ], axis=1).astype(np.int32)
+
+    values = []
+    normalize = _stores_class_counts()
+    for tree in trees:
+        value = tree.value[:, 0, :].astype(np.float64)
+        if normalize:
+            # Same normalisation DecisionTreeClassifier.predict_proba applies
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer
+        values.append(value)
+
+    return {
+        "tree_offsets": offsets,
+        "feature": np.where(leaf, 0, np.concatenate([t.feature for t in trees])).astype(np.int16),
+        "threshold": np.where(leaf, 0, _float32_floor(np.concatenate([t.threshold for t in trees]))).astype(np.float32),
+        "children": children,
+        "missing_left": np.concatenate(
+            [getattr(t, "missing_go_to_left", np.zeros(t.node_count, dtype=np.uint8)) for t in trees]
+        ).astype(np.uint8),
+        "value": np.concatenate(values).astype(np.float16 if quantize else np.float64),
+    }
+
+
+def _header(model, features, quantize, metadata):
+    return {
+        "format": FORMAT_VERSION,
+        "features": list(features),
+        "classes": np.asarray(model.classes_).tolist(),
+        "n_trees": len(model.estimators_),
+        "quantized": bool(quantize),
+        "feature_importances": np.asarray(model.feature_importances_).tolist(),
+        "metadata": metadata or {},
+        "arrays": {},
+    }
+
+
+def save_forest(model, features, path=FOREST_PATH, quantize=False, metadata=None):
+    """Export a fitted forest; `quantize` stores leaf probabilities as float16."""
+    arrays = compile_arrays(model, quantize=quantize)
+    header = _header(model, features, quantize, metadata)
+
+    # Offsets are relative to the aligned data section, so the header can be
+    # serialised once without knowing its own length
+    offset = 0
+    for name, values in arrays.items():
+        header["arrays"][name] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+        offset += -(-values.nbytes // ALIGN) * ALIGN
+    header_bytes = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGN) * ALIGN
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, values in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(values).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+    return path
+
+
+class CompiledForest:
+    """Read-only forest over stacked node arrays.
+
+    Mirrors the parts of RandomForestClassifier the app uses: `classes_`,
+    `feature_importances_`, `predict_proba()` and `predict()`.  All trees are
+    traversed together for a block of rows, one depth level per NumPy step,
+    and probabilities match sklearn's bit for bit.  This skips sklearn's
+    per-call validation and per-estimator Python loop, which dominates single
+    rows and small batches; for batches in the thousands sklearn's compiled
+    traversal is faster.
+    """
+
+    # Rows per traversal block; bounds the (rows x trees x classes) leaf buffer
+    block_size = 2048
+    # Drop finished (row, tree) pairs once fewer than this share are still moving
+    compact_below = 0.5
+
+    def __init__(self, arrays, header):
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self.features = header["features"]
+        self.classes_ = np.asarray(header["classes"])
+        self.n_estimators = header["n_trees"]
+        self.quantized = header["quantized"]
+        self.feature_importances_ = np.asarray(header["feature_importances"])
+        self.metadata = header["metadata"]
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns") and list(X.columns) != self.features:
+            X = X[self.features]
+        return np.asarray(X, dtype=np.float32).reshape(-1, len(self.features))
+
+    def _leaves(self, X):
+        # Leaf node of every (row, tree) pair, shape (n_rows, n_trees)
+        roots = self.tree_offsets[:-1]
+        children = self.children.ravel()
+        flat_x = X.ravel()
+        has_nan = np.isnan(flat_x).any()
+
+        leaves = np.tile(roots, len(X))
+        pos = np.arange(leaves.size)
+        node = leaves.copy()
+        base = (pos // len(roots)) * X.shape[1]
+        while pos.size:
+            x = flat_x[base + self.feature[node]]
+            # Equivalent to sklearn's `x <= threshold -> left` for non-NaN x
+            go_right = x > self.threshold[node]
+            if has_nan:
+                go_right = np.where(np.isnan(x), self.missing_left[node] == 0, go_right)
+            step = children[2 * node + go_right]
+            moved = step != node
+            node = step
+            # Pairs sitting on a leaf stop moving; compacting every level
+            # costs more than carrying a few idle pairs along
+            n_moved = np.count_nonzero(moved)
+            if n_moved < self.compact_below * pos.size:
+                leaves[pos] = node
+                pos, node, base = pos[moved], node[moved], base[moved]
+        leaves[pos] = node
+        return leaves.reshape(len(X), len(roots))
+
+    def predict_proba(self, X):
+        X = self._as_matrix(X)
+        proba = np.empty((len(X), len(self.classes_)))
+        for start in range(0, len(X), self.block_size):
+            block = X[start:start + self.block_size]
+            values = self.value[self._leaves(block)].astype(np.float64, copy=False)
+            # cumsum adds strictly left to right, matching sklearn's sequential
+            # `out += tree.predict_proba(X)` (a plain sum would be pairwise)
+            proba[start:start + len(block)] = np.cumsum(values, axis=1)[:, -1]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def compile_forest(model, features, quantize=False):
+    """In-memory CompiledForest for a fitted RandomForest/ExtraTrees classifier."""
+    return CompiledForest(compile_arrays(model, quantize=quantize), _header(model, features, quantize, None))
+
+
+def load_forest(path=FOREST_PATH):
+    """Map an artifact written by `save_forest()`; arrays are paged in lazily."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a forest artifact")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+    if header["format"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported forest format {header['format']} in {path}")
+
+    data_start = -(-(len(MAGIC) + 8 + header_len) // ALIGN) * ALIGN
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {
+        name: np.ndarray(
+            tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]),
+            buffer=buffer, offset=data_start + spec["offset"],
+        )
+        for name, spec in header["arrays"].items()
+    }
+    return CompiledForest(arrays, header)
+
+
+def forest_is_fresh(path=FOREST_PATH, pickle_path="model.pkl"):
+    """True when the artifact exists and is not older than model.pkl."""
+    if not os.path.exists(path):
+        return False
+    return not os.path.exists(pickle_path) or os.path.getmtime(path) >= os.path.getmtime(pickle_path)
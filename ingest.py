@@ -0,0 +1,132 @@
+"""Merge a delta file of new or updated games into the snapshot.
+
+    python ingest.py delta.csv
+
+Rows are keyed by `app_id`: known ids are updated in place (only the columns
+the delta carries; blank cells keep the stored value), unknown ids are
+appended and must carry a value in every column.  Merged columns keep the
+snapshot's dtypes; values that do not fit are rejected.
+The snapshot version is bumped and the touched row positions are logged in
+the manifest, so the dashboard and the prediction cache only recompute those
+rows instead of re-parsing games.csv.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from store import MANIFEST, STORE_DIR, read_manifest, read_snapshot, write_snapshot
+
+
+def _cast(name, values, dtype):
+    """Delta values (none missing) as the snapshot column's dtype, or ValueError."""
+    if dtype == bool:
+        if values.dtype == bool:
+            return values.to_numpy()
+        text = values.astype(str).str.strip().str.lower()
+        flags = text.map({"true": True, "false": False, "1": True, "0": False, "1.0": True, "0.0": False})
+        if flags.isna().any():
+            raise ValueError(f"{name}: expected True/False, got {values[flags.isna()].iloc[0]!r}")
+        return flags.to_numpy(dtype=bool)
+    numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+    if np.isnan(numeric).any():
+        raise ValueError(f"{name}: expected numbers, got {values[np.isnan(numeric)].iloc[0]!r}")
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        if numeric.size and ((numeric != np.round(numeric)).any() or numeric.min() < info.min
+                             or numeric.max() > info.max):
+            raise ValueError(f"{name}: values do not fit the snapshot's {dtype} column")
+    return numeric.astype(dtype)
+
+
+def _merge_column(name, column, values, found):
+    """`column` with the delta's values written over rows `found` (>= 0) and its new rows appended.
+
+    Missing delta cells leave the stored value as it is; the column keeps its dtype.
+    """
+    new = found < 0
+    rows = new | values.notna().to_numpy()
+    values = values[rows]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Snapshot categories are strings; old codes stay valid, new values
+        # become categories after them
+        values = values.astype(str)
+        categories = column.cat.categories
+        extra = pd.Index(values.unique(), dtype=categories.dtype)
+        dtype = pd.CategoricalDtype(categories.append(extra[~extra.isin(categories)]))
+        old, values = column.cat.codes.to_numpy(), pd.Categorical(values, dtype=dtype).codes
+    else:
+        old, values = column.to_numpy(), _cast(name, values, column.dtype)
+
+    update = ~new[rows]
+    merged = np.concatenate([old, values[~update]]).astype(old.dtype if len(old) else values.dtype, copy=False)
+    merged[found[rows][update]] = values[update]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return pd.Series(pd.Categorical.from_codes(merged, dtype=dtype))
+    return pd.Series(merged)
+
+
+def merge_delta(delta, store_dir=STORE_DIR):
+    """Apply `delta` (a frame keyed by app_id) to the snapshot.
+
+    Returns the new manifest and the number of updated and appended rows.
+    """
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"{os.path.join(store_dir, MANIFEST)} (run `python store.py` first)")
+    if "app_id" not in delta.columns:
+        raise ValueError("Delta file needs an app_id column")
+    unknown = [c for c in delta.columns if c not in manifest["columns"]]
+    if unknown:
+        raise ValueError(f"Columns not found in games data: {unknown}")
+
+    df = read_snapshot(store_dir=store_dir)
+    n_rows = len(df)
+    delta = delta.drop_duplicates("app_id", keep="last").reset_index(drop=True)
+    app_ids = _cast("app_id", delta["app_id"], df["app_id"].dtype)
+
+    # Duplicate app_ids in the snapshot resolve to their first row
+    ids = df["app_id"].drop_duplicates()
+    found = pd.Index(ids.to_numpy()).get_indexer(app_ids)
+    is_new = found < 0
+    found[~is_new] = ids.index.to_numpy()[found[~is_new]]
+    missing = [c for c in df.columns if c not in delta.columns]
+    if is_new.any() and missing:
+        raise ValueError(f"New app_ids need every column; delta is missing: {missing}")
+    blank = [c for c in delta.columns if delta.loc[is_new, c].isna().any()]
+    if blank:
+        raise ValueError(f"New app_ids need a value in every column; blank cells in: {blank}")
+
+    merged = pd.DataFrame({
+        name: _merge_column(name, df[name], delta[name], found) if name in delta.columns else df[name]
+        for name in df.columns
+    })
+
+    n_appended = int(is_new.sum())
+    changed = np.concatenate([found[~is_new], np.arange(n_rows, n_rows + n_appended)])
+    return write_snapshot(
+        merged, store_dir, source=manifest["source"], version=manifest["version"] + 1, changed=changed
+    ), len(delta) - n_appended, n_appended
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge new or updated games into the snapshot.")
+    parser.add_argument("delta", help="CSV of new or changed rows keyed by app_id")
+    parser.add_argument("--store", default=STORE_DIR, help="snapshot directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        manifest, n_updated, n_appended = merge_delta(pd.read_csv(args.delta), args.store)
+    except ValueError as e:
+        sys.exit(f"❌ {args.delta} not merged: {e}")
+    print(f"✅ Merged {args.delta}: {n_updated:,} updated, {n_appended:,} new rows "
+          f"in {time.perf_counter() - start:.2f}s")
+    print(f"✅ Snapshot version {manifest['version']} ({manifest['n_rows']:,} rows)")
+
+
+if __name__ == "__main__":
+    main()
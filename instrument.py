@@ -0,0 +1,201 @@
+"""Lightweight hot-path instrumentation for app.py.
+
+    with timed("load_model"):
+        model, features = load_model(path)
+
+    @timed("build_chart")       # also works as a decorator
+    def build_chart(...): ...
+
+Every stage keeps a call count, total/max/last time and a latency histogram in
+a process-wide registry.  Calling `cache_miss(stage)` inside an `st.cache_*`
+function body turns the stage's calls into a cache hit rate.  The hidden admin
+panel (open the app with `?admin=1`) shows both tables.  Environment flags:
+
+    SGR_TIMINGS=1   print the stage times of every rerun
+    SGR_PROFILE=1   dump a cProfile of every rerun into profiles/ (one rerun
+                    at a time; concurrent reruns are not profiled)
+
+`mark(stage)` records the time since the top of the rerun instead, e.g. how
+long the first paint of the sidebar took.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, float("inf"))
+PROFILE_DIR = "profiles"
+
+
+class Stage:
+    __slots__ = ("calls", "misses", "total", "max", "last", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.misses = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.histogram = np.zeros(len(BUCKETS_MS), dtype=np.int64)
+
+    def quantile_ms(self, q):
+        # Upper bound of the bucket holding the q-th call
+        if not self.calls:
+            return float("nan")
+        bucket = int(np.searchsorted(np.cumsum(self.histogram), q * self.calls))
+        return min(BUCKETS_MS[bucket], self.max * 1000)
+
+
+class Registry:
+    """Thread-safe per-stage counters shared by every session of the app."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def _stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage()
+        return stage
+
+    def record(self, name, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            stage = self._stage(name)
+            stage.calls += 1
+            stage.total += seconds
+            stage.max = max(stage.max, seconds)
+            stage.last = seconds
+            stage.histogram[np.searchsorted(BUCKETS_MS, ms)] += 1
+
+    def miss(self, name):
+        with self._lock:
+            self._stage(name).misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+
+    def stage_table(self):
+        with self._lock:
+            rows = [{
+                "stage": name,
+                "calls": s.calls,
+                "mean ms": s.total / s.calls * 1000,
+                "p50 ms ≤": s.quantile_ms(0.5),
+                "p95 ms ≤": s.quantile_ms(0.95),
+                "max ms": s.max * 1000,
+                "last ms": s.last * 1000,
+                "total s": s.total,
+            } for name, s in self.stages.items() if s.calls]
+        return pd.DataFrame(rows).sort_values("total s", ascending=False) if rows else pd.DataFrame()
+
+    def cache_table(self):
+        with self._lock:
+            rows = [{
+                "cache": name,
+                "calls": s.calls,
+                "misses": s.misses,
+                "hit rate": 1 - min(s.misses, s.calls) / s.calls,
+            } for name, s in self.stages.items() if s.misses and s.calls]
+        return pd.DataFrame(rows)
+
+
+REGISTRY = Registry()
+_rerun = threading.local()
+# Since Python 3.12 a profiler is process-wide: one profiled rerun at a time
+_profile_lock = threading.Lock()
+_active_profile = None  # (thread, cProfile.Profile)
+
+
+@contextmanager
+def timed(stage):
+    """Time a block (or, as a decorator, every call) under `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        REGISTRY.record(stage, seconds)
+        timings = getattr(_rerun, "timings", None)
+        if timings is not None:
+            timings.append((stage, seconds))
+
+
+def mark(stage):
+    """Record the time since the top of this script run under `stage`."""
+    start = getattr(_rerun, "start", None)
+    if start is None:
+        return
+    seconds = time.perf_counter() - start
+    REGISTRY.record(stage, seconds)
+    timings = getattr(_rerun, "timings", None)
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+def cache_miss(stage):
+    """Call from inside a cached function body: the body only runs on a miss."""
+    REGISTRY.miss(stage)
+
+
+def _start_profile():
+    global _active_profile
+    with _profile_lock:
+        if _active_profile is not None:
+            thread, profile = _active_profile
+            if thread is not threading.current_thread() and thread.is_alive():
+                # Another session's rerun is being profiled; skip this one
+                return None
+            # Left enabled by a rerun that never reached finish_rerun()
+            # (RerunException, StopException or an error)
+            profile.disable()
+            _active_profile = None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # Python >= 3.12: another profiler is active
+            return None
+        _active_profile = (threading.current_thread(), profile)
+        return profile
+
+
+def _stop_profile(profile):
+    global _active_profile
+    with _profile_lock:
+        profile.disable()
+        if _active_profile is not None and _active_profile[1] is profile:
+            _active_profile = None
+
+
+def start_rerun():
+    """Mark the top of a script run: starts per-rerun logging and profiling."""
+    _rerun.timings = [] if os.environ.get("SGR_TIMINGS") else None
+    _rerun.start = time.perf_counter()
+    _rerun.profile = _start_profile() if os.environ.get("SGR_PROFILE") else None
+
+
+def finish_rerun():
+    """Mark the end of a script run; reruns cut short by Streamlit are skipped."""
+    start = getattr(_rerun, "start", None)
+    if start is None:
+        return
+    REGISTRY.record("rerun", time.perf_counter() - start)
+    profile = _rerun.profile
+    if profile is not None:
+        _stop_profile(profile)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"rerun-{time.time_ns()}.prof")
+        profile.dump_stats(path)
+        print(f"⏱️ Profile saved to {path}", file=sys.stderr)
+    if _rerun.timings is not None:
+        stages = " | ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in _rerun.timings)
+        print(f"⏱️ rerun {(time.perf_counter() - start) * 1000:.1f}ms: {stages}", file=sys.stderr)
+    _rerun.start = _rerun.profile = _rerun.timings = None
@@ -0,0 +1,100 @@
+"""Local load generator for serve.py.
+
+Opens `--concurrency` keep-alive connections and fires requests back to back
+for `--duration` seconds, then reports throughput and p50/p99 latency.
+
+    python serve.py &
+    python loadgen.py --concurrency 64 --duration 10 --endpoint by_title
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from registry import current_model, model_files
+from store import load_games
+
+
+async def _request(reader, writer, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _worker(host, port, path, bodies, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await _request(reader, writer, path, random.choice(bodies))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def _bodies(endpoint, batch, n=1000):
+    if endpoint == "by_title":
+        titles = load_games(["title"])["title"].dropna().astype(str).unique()
+        return [json.dumps({"title": t}).encode() for t in random.sample(list(titles), min(n, len(titles)))]
+    import joblib
+
+    # The columns the served model expects (see serve.py)
+    features = joblib.load(model_files(current_model())[1])
+    X = load_games(features)[features].to_numpy(dtype=np.float64)
+    rows = X[np.random.default_rng(0).integers(0, len(X), size=(n, batch))]
+    return [json.dumps({"rows": r.tolist()}).encode() for r in rows]
+
+
+async def run(host, port, endpoint, concurrency, duration, batch):
+    path = "/predict/by_title" if endpoint == "by_title" else "/predict"
+    bodies = _bodies(endpoint, batch)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        _worker(host, port, path, bodies, deadline, latencies, errors) for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    print(f"✅ {len(ms):,} requests in {elapsed:.1f}s with {concurrency} connections ({endpoint})")
+    print(f"   throughput: {len(ms) / elapsed:,.0f} req/s ({len(ms) * batch / elapsed:,.0f} rows/s)"
+          if endpoint == "predict" else f"   throughput: {len(ms) / elapsed:,.0f} req/s")
+    print(f"   latency:    p50 {np.percentile(ms, 50):.2f} ms | p99 {np.percentile(ms, 99):.2f} ms | "
+          f"max {ms.max():.2f} ms")
+    if errors:
+        print(f"❌ {len(errors):,} non-200 responses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test serve.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--endpoint", choices=["predict", "by_title"], default="predict")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--batch", type=int, default=1, help="rows per /predict request")
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.endpoint, args.concurrency, args.duration, args.batch))
+
+
+if __name__ == "__main__":
+    main()
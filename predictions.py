@@ -0,0 +1,128 @@
+"""Precomputed hit probabilities for every game in the catalog.
+
+Features are static per game, so `predict_proba` is run once per
+(model, dataset) fingerprint and the result is stored as a sidecar .npy file
+in row order.  The dashboard looks rows up instead of running the forest.
+After a delta ingest (see ingest.py) the previous sidecar is reused and only
+the changed rows are re-scored.
+
+    python predictions.py          # precompute for the current model + data
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from registry import active_paths, current_model, model_files, read_manifest
+from store import CSV_PATH, changed_rows, dataset_version, iter_games, load_games, snapshot_version
+
+MODEL_PATH = "model.pkl"
+PREDICTIONS_DIR = "predictions"
+
+
+def model_version(path=MODEL_PATH):
+    """Cheap fingerprint of the model file (size + mtime)."""
+    st = os.stat(path)
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def cache_path(model_ver, data_ver, predictions_dir=PREDICTIONS_DIR):
+    digest = hashlib.sha1(f"{model_ver}|{data_ver}".encode()).hexdigest()[:16]
+    return os.path.join(predictions_dir, f"proba-{digest}.npy")
+
+
+def build_predictions(model, features, chunksize=100_000, csv_path=CSV_PATH):
+    """`predict_proba` for the whole catalog, in row order, one call per chunk."""
+    parts = []
+    for chunk in iter_games(list(features), chunksize=chunksize, csv_path=csv_path):
+        parts.append(model.predict_proba(chunk[features]))
+    if not parts:
+        return np.empty((0, len(model.classes_)))
+    return np.concatenate(parts)
+
+
+def _read_meta(path):
+    try:
+        with open(path[:-len(".npy")] + ".json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def update_predictions(model, features, model_ver, predictions_dir=PREDICTIONS_DIR):
+    """Probabilities patched from an older sidecar of the same model, or None.
+
+    Only rows the store logged as changed since that sidecar's snapshot are
+    re-scored; everything else is copied over.
+    """
+    for path in glob.glob(os.path.join(predictions_dir, "proba-*.npy")):
+        meta = _read_meta(path)
+        if meta is None or meta["model_version"] != model_ver:
+            continue
+        rows = changed_rows(meta["store_version"])
+        if rows is None:
+            continue
+        previous = np.load(path, mmap_mode="r")
+        frame = load_games(list(features))
+        proba = np.empty((len(frame), previous.shape[1]))
+        proba[:len(previous)] = previous[:len(frame)]
+        rows = rows[rows < len(frame)]
+        if len(rows):
+            proba[rows] = model.predict_proba(frame.iloc[rows][features])
+        return proba
+    return None
+
+
+def _registry_model_versions():
+    # Fingerprints of the registry's current and previous models
+    manifest = read_manifest()
+    if manifest is None:
+        return set()
+    return {model_version(p) for p in active_paths(manifest) if p and os.path.exists(p)}
+
+
+def load_predictions(model, features, model_ver, data_ver, predictions_dir=PREDICTIONS_DIR):
+    """Cached probabilities for this fingerprint, computing and saving them on a miss."""
+    path = cache_path(model_ver, data_ver, predictions_dir)
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    # Before reading any rows, so a delta landing meanwhile is re-scored next time
+    store_version = snapshot_version()
+    proba = update_predictions(model, features, model_ver, predictions_dir)
+    if proba is None:
+        proba = build_predictions(model, features)
+    os.makedirs(predictions_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, proba)
+    os.replace(tmp, path)
+    meta = {"model_version": model_ver, "data_version": data_ver, "store_version": store_version}
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path[:-len(".npy")] + ".json")
+
+    # Older sidecars of this model can never be hit again, and neither can
+    # those of models the registry no longer holds as current or previous
+    # (the previous model's are kept: a rollback reuses or patches them)
+    rollback_versions = _registry_model_versions() - {model_ver}
+    for stale in glob.glob(os.path.join(predictions_dir, "proba-*.npy")):
+        meta = _read_meta(stale)
+        if stale != path and (meta is None or meta["model_version"] not in rollback_versions):
+            for sidecar in (stale, stale[:-len(".npy")] + ".json"):
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+    return np.load(path, mmap_mode="r")
+
+
+if __name__ == "__main__":
+    import joblib
+
+    # Same fingerprint as the app: the registry's current model path
+    path = current_model()
+    model_file, features_file = model_files(path)
+    model, features = joblib.load(model_file), joblib.load(features_file)
+    proba = load_predictions(model, features, model_version(path), dataset_version())
+    print(f"✅ Cached predictions for {len(proba):,} games in {cache_path(model_version(path), dataset_version())}")
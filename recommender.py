@@ -0,0 +1,145 @@
+"""Content-based "similar games" recommender.
+
+Games are embedded as standardized float32 vectors of the same columns the
+model uses (prices and review counts log-scaled first), and the k nearest
+neighbours of every game are precomputed with blocked brute-force matmuls.
+The table is saved next to model.pkl, so a lookup is a single row read.
+
+    python recommender.py --k 20
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from store import dataset_version, load_games
+
+SIMILAR_PATH = "similar_games.npz"
+COLUMNS = ["price_final", "discount", "win", "mac", "linux", "steam_deck", "user_reviews", "positive_ratio"]
+# Heavy-tailed columns are compared on a log scale
+LOG_COLUMNS = ["price_final", "user_reviews"]
+# Float32 distance block kept in memory at once while building
+BLOCK_BYTES = 64 * 1024 ** 2
+
+
+def _raw_matrix(df):
+    X = df[COLUMNS].to_numpy(dtype=np.float32)
+    for i, name in enumerate(COLUMNS):
+        if name in LOG_COLUMNS:
+            X[:, i] = np.log1p(np.maximum(X[:, i], 0))
+    return np.nan_to_num(X)
+
+
+def _top_k(dist, k):
+    # k smallest per row, ordered by distance then by row position
+    k = min(k, dist.shape[1])
+    part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    part_dist = np.take_along_axis(dist, part, axis=1)
+    order = np.lexsort((part, part_dist), axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_dist, order, axis=1)
+
+
+class SimilarGames:
+    """Standardized game vectors plus an optional precomputed k-NN table."""
+
+    def __init__(self, matrix, mean, std, version, neighbours=None, distances=None):
+        self.matrix = matrix
+        self.mean = mean
+        self.std = std
+        self.version = version
+        self.neighbours = neighbours
+        self.distances = distances
+        self.sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+
+    @classmethod
+    def from_frame(cls, df, version=None):
+        X = _raw_matrix(df)
+        mean = X.mean(axis=0)
+        std = X.std(axis=0)
+        std[std == 0] = 1
+        return cls((X - mean) / std, mean, std, version)
+
+    def embed(self, df):
+        return (_raw_matrix(df) - self.mean) / self.std
+
+    def _distances(self, queries, q_norms):
+        # Squared euclidean distance via |q|^2 + |x|^2 - 2 q.x
+        dist = q_norms[:, None] + self.sq_norms[None, :] - 2 * queries @ self.matrix.T
+        return np.maximum(dist, 0, out=dist)
+
+    def build(self, k=20):
+        """Precompute the k nearest neighbours of every game (excluding itself)."""
+        n = len(self.matrix)
+        k = min(k, n - 1)
+        block = max(1, BLOCK_BYTES // (4 * max(n, 1)))
+        self.neighbours = np.empty((n, k), dtype=np.int32)
+        self.distances = np.empty((n, k), dtype=np.float32)
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            dist = self._distances(self.matrix[start:stop], self.sq_norms[start:stop])
+            dist[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            idx, d = _top_k(dist, k)
+            self.neighbours[start:stop] = idx
+            self.distances[start:stop] = np.sqrt(d)
+        return self
+
+    def similar(self, pos, k=5):
+        """Row positions of the k games most similar to row `pos`."""
+        if self.neighbours is not None and k <= self.neighbours.shape[1]:
+            return self.neighbours[pos, :k]
+        # No (or too short a) precomputed table: one brute-force row
+        dist = self._distances(self.matrix[pos:pos + 1], self.sq_norms[pos:pos + 1])
+        dist[0, pos] = np.inf
+        return _top_k(dist, k)[0][0]
+
+    def query(self, vectors, k=5):
+        """Nearest catalog rows for already-embedded vectors (e.g. what-if edits)."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        dist = self._distances(vectors, np.einsum("ij,ij->i", vectors, vectors))
+        return _top_k(dist, k)[0]
+
+    def save(self, path=SIMILAR_PATH):
+        if self.neighbours is None:
+            raise ValueError("build() the neighbour table before saving")
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp, matrix=self.matrix, mean=self.mean, std=self.std, version=np.array(self.version),
+            neighbours=self.neighbours, distances=self.distances,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=SIMILAR_PATH):
+        with np.load(path) as data:
+            return cls(
+                data["matrix"], data["mean"], data["std"], str(data["version"]),
+                data["neighbours"], data["distances"],
+            )
+
+
+def load_similar(version, path=SIMILAR_PATH):
+    """Saved index if it was built for `version`, else vectors only (query on demand)."""
+    if os.path.exists(path):
+        index = SimilarGames.load(path)
+        if index.version == version:
+            return index
+    return SimilarGames.from_frame(load_games(COLUMNS), version)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the similar-games index.")
+    parser.add_argument("--k", type=int, default=20, help="neighbours stored per game")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    version = dataset_version()
+    index = SimilarGames.from_frame(load_games(COLUMNS), version).build(args.k)
+    index.save()
+    print(f"✅ Indexed {len(index.matrix):,} games (k={index.neighbours.shape[1]}) "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"✅ Saved {SIMILAR_PATH}")
+
+
+if __name__ == "__main__":
+    main()
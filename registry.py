@@ -0,0 +1,181 @@
+"""Versioned on-disk model registry.
+
+    models/
+        manifest.json       {"current": "v0003", "previous": "v0002", "versions": {...}}
+        v0002/  model.pkl  features.pkl  model.json  model.forest
+        v0003/  model.pkl  features.pkl
+
+Every version records its metrics, feature list and dataset fingerprint.  A
+version directory is never modified after it is published; promoting or
+rolling back only rewrites the manifest (atomically), so the app polls a
+single mtime and hot-swaps by loading the new version's path.  Scripts
+(serve.py, score.py, predictions.py, ...) load `current_model()` too.
+
+    python registry.py publish       # register the current model.pkl (train.py does this)
+    python registry.py list
+    python registry.py promote v0002
+    python registry.py rollback      # swap current and previous
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+from forest import FOREST_PATH, forest_is_fresh
+from store import _write_json, dataset_version, snapshot_version
+
+REGISTRY_DIR = "models"
+MANIFEST = "manifest.json"
+# Written next to model.pkl by train.py / stream_train.py
+MODEL_METADATA = "model.json"
+# Older versions are deleted on publish, except current and previous
+KEEP_VERSIONS = 5
+
+
+def read_manifest(registry_dir=REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def manifest_stamp(registry_dir=REGISTRY_DIR):
+    """mtime of the manifest (None without a registry): a cheap change check."""
+    try:
+        return os.stat(os.path.join(registry_dir, MANIFEST)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def model_path(version, registry_dir=REGISTRY_DIR):
+    """Path to load for `version`: its forest artifact when it has one, else model.pkl."""
+    version_dir = os.path.join(registry_dir, version)
+    forest = os.path.join(version_dir, FOREST_PATH)
+    return forest if os.path.exists(forest) else os.path.join(version_dir, "model.pkl")
+
+
+def current_model(registry_dir=REGISTRY_DIR):
+    """Path of the model to serve: the current version, or the working directory's files."""
+    manifest = read_manifest(registry_dir)
+    if manifest is None:
+        return FOREST_PATH if forest_is_fresh() else "model.pkl"
+    return model_path(manifest["current"], registry_dir)
+
+
+def model_files(path):
+    """(model.pkl, features.pkl) next to a model path; batch scoring wants the pickle."""
+    directory = os.path.dirname(path)
+    return os.path.join(directory, "model.pkl"), os.path.join(directory, "features.pkl")
+
+
+def active_paths(manifest, registry_dir=REGISTRY_DIR):
+    """(current, previous) model paths of a manifest; previous may be None."""
+    previous = manifest.get("previous")
+    return (model_path(manifest["current"], registry_dir),
+            model_path(previous, registry_dir) if previous else None)
+
+
+def _next_version(manifest):
+    numbers = [int(v[1:]) for v in manifest["versions"]] if manifest else []
+    return f"v{max(numbers, default=0) + 1:04d}"
+
+
+def _prune(manifest, registry_dir):
+    keep = {manifest["current"], manifest.get("previous")}
+    old = sorted(v for v in manifest["versions"] if v not in keep)[:-KEEP_VERSIONS]
+    for version in old:
+        del manifest["versions"][version]
+        shutil.rmtree(os.path.join(registry_dir, version), ignore_errors=True)
+
+
+def publish(metrics=None, registry_dir=REGISTRY_DIR, promote_version=True):
+    """Copy model.pkl, features.pkl (and a fresh model.forest) into a new version."""
+    import joblib
+
+    manifest = read_manifest(registry_dir) or {"current": None, "previous": None, "versions": {}}
+    version = _next_version(manifest)
+    files = ["model.pkl", "features.pkl"] + ([FOREST_PATH] if forest_is_fresh() else [])
+    # Training metadata (split, data versions) that train.py --refresh reads
+    if forest_is_fresh(MODEL_METADATA):
+        files.append(MODEL_METADATA)
+
+    # Copy into a temp dir first, so a version directory is always complete
+    tmp_dir, version_dir = os.path.join(registry_dir, version + ".tmp"), os.path.join(registry_dir, version)
+    # Leftovers of an interrupted publish were never in the manifest
+    for leftover in (tmp_dir, version_dir):
+        shutil.rmtree(leftover, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name in files:
+        shutil.copy2(name, os.path.join(tmp_dir, name))
+    os.replace(tmp_dir, version_dir)
+
+    manifest["versions"][version] = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "dataset_version": dataset_version(),
+        "store_version": snapshot_version(),
+        "features": list(joblib.load("features.pkl")),
+        "metrics": metrics or {},
+        "files": files,
+    }
+    if promote_version or manifest["current"] is None:
+        manifest["previous"], manifest["current"] = manifest["current"], version
+    _prune(manifest, registry_dir)
+    _write_json(os.path.join(registry_dir, MANIFEST), manifest)
+    return version
+
+
+def promote(version, registry_dir=REGISTRY_DIR):
+    """Make `version` current; the old current becomes the rollback version."""
+    manifest = read_manifest(registry_dir)
+    if manifest is None or version not in manifest["versions"]:
+        raise KeyError(f"Unknown model version {version!r}")
+    if version != manifest["current"]:
+        manifest["previous"], manifest["current"] = manifest["current"], version
+        _write_json(os.path.join(registry_dir, MANIFEST), manifest)
+    return manifest
+
+
+def rollback(registry_dir=REGISTRY_DIR):
+    """Swap the current and previous versions."""
+    manifest = read_manifest(registry_dir)
+    if manifest is None or not manifest.get("previous"):
+        raise KeyError("No previous model version to roll back to")
+    return promote(manifest["previous"], registry_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry.")
+    parser.add_argument("--registry", default=REGISTRY_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    publish_cmd = commands.add_parser("publish", help="register the current model.pkl")
+    publish_cmd.add_argument("--no-promote", action="store_true", help="register without making it current")
+    commands.add_parser("promote").add_argument("version")
+    commands.add_parser("rollback")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        version = publish(registry_dir=args.registry, promote_version=not args.no_promote)
+        print(f"✅ Published {version}")
+    elif args.command == "promote":
+        promote(args.version, args.registry)
+        print(f"✅ {args.version} is now current")
+    elif args.command == "rollback":
+        manifest = rollback(args.registry)
+        print(f"✅ Rolled back to {manifest['current']}")
+
+    manifest = read_manifest(args.registry)
+    if manifest is None:
+        print(f"No registry in {args.registry}/")
+        return
+    for version, entry in sorted(manifest["versions"].items()):
+        role = "current" if version == manifest["current"] else "previous" if version == manifest["previous"] else ""
+        accuracy = entry["metrics"].get("accuracy")
+        accuracy = f"{accuracy:.4f}" if accuracy is not None else "-"
+        print(f"{version}  {role:<9}{entry['created_at']}  accuracy {accuracy}  data {entry['dataset_version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Batch-score the whole catalog with the trained model.
+
+Streams the games table in fixed-size chunks (snapshot or games.csv), calls
+`predict_proba` once per chunk and appends `app_id,title,prob,hit` rows to the
+output CSV, so memory stays bounded however large the catalog gets.
+
+    python score.py --output scores.csv --chunksize 100000
+"""
+import argparse
+import time
+
+import joblib
+import numpy as np
+
+from registry import current_model, model_files
+from store import CSV_PATH, iter_games
+
+def score_frame(model, features, chunk):
+    """Hit probability and label for every row of `chunk` from one predict_proba call."""
+    proba = model.predict_proba(chunk[features])
+    # Same label as model.predict(), without running the trees a second time
+    hit = model.classes_.take(np.argmax(proba, axis=1))
+    return proba[:, 1], hit
+
+
+def score_catalog(model, features, output, chunksize=100_000, csv_path=CSV_PATH):
+    columns = ["app_id", "title"] + [f for f in features if f not in ("app_id", "title")]
+    n_rows = 0
+    with open(output, "w", newline="") as f:
+        for chunk in iter_games(columns, chunksize=chunksize, csv_path=csv_path):
+            prob, hit = score_frame(model, features, chunk)
+            out = chunk[["app_id", "title"]].assign(prob=prob, hit=hit.astype(int))
+            out.to_csv(f, header=n_rows == 0, index=False, float_format="%.6f")
+            n_rows += len(out)
+    return n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every game in the catalog.")
+    parser.add_argument("--input", default=CSV_PATH, help="games CSV (its snapshot is used when fresh)")
+    parser.add_argument("--output", default="scores.csv")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--model", default=None, help="model.pkl to use (default: the registry's current model)")
+    parser.add_argument("--features", default=None, help="features.pkl to use (default: the current model's)")
+    args = parser.parse_args()
+
+    model_file, features_file = model_files(current_model())
+    model = joblib.load(args.model or model_file)
+    features = joblib.load(args.features or features_file)
+
+    start = time.perf_counter()
+    n_rows = score_catalog(model, features, args.output, args.chunksize, args.input)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {n_rows:,} games in {elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"✅ Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Server-side title search for the game selector.
+
+Titles are normalized (case, accents, punctuation; any script) and indexed
+two ways:
+
+* a sorted list of every title and every word-start suffix of it, so a prefix
+  query is a bisect range -- a flattened prefix trie;
+* a trigram posting list, so typos still find the title.
+
+Results are ranked exact title, title-prefix, word-prefix, then fuzzy, with
+`user_reviews` breaking ties, and capped at `limit` (50 by default).
+"""
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Share of the query's trigrams a title must contain to count as a fuzzy match
+MIN_SIMILARITY = 0.4
+# Shorter queries are only matched by prefix
+MIN_FUZZY_LENGTH = 3
+# Above every character, so key + _MAX_CHAR bounds all keys starting with key
+_MAX_CHAR = chr(0x10FFFF)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Accents are dropped from Latin and Greek letters only: in other scripts
+# combining marks (kana voicing marks, Indic vowel signs) change the word
+_ACCENTED_BELOW = "\u0400"
+
+
+def _fold(text):
+    # Letters, digits and marks of every script are word characters
+    chars, base = [], ""
+    for c in unicodedata.normalize("NFKD", text):
+        if unicodedata.combining(c) and base < _ACCENTED_BELOW:
+            continue
+        if not unicodedata.combining(c):
+            base = c
+        chars.append(c if unicodedata.category(c)[0] in "LMN" else " ")
+    return unicodedata.normalize("NFC", "".join(chars))
+
+
+def normalize(text):
+    text = str(text).casefold()
+    if text.isascii():
+        return _NON_ALNUM.sub(" ", text).strip()
+    # NFKD can reintroduce capitals ("™" -> "TM")
+    return " ".join(_fold(text).casefold().split())
+
+
+def trigrams(key):
+    # Per-word padding as in pg_trgm, so word starts carry their own trigrams
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TitleSearch:
+    """Prefix + trigram index over unique titles, ranked by popularity."""
+
+    def __init__(self, titles, popularity):
+        self.titles = np.asarray(titles, dtype=object)
+        self.popularity = np.asarray(popularity, dtype=np.float64)
+        # Most reviewed first; the default list when there is no query
+        self.by_popularity = np.argsort(-self.popularity, kind="stable")
+
+        keys = [normalize(t) for t in self.titles]
+        entries = []
+        for i, key in enumerate(keys):
+            entries.append((key, 0, i))
+            for match in re.finditer(r" ", key):
+                entries.append((key[match.end():], 1, i))
+        entries.sort()
+        self._prefix_keys = [key for key, _, _ in entries]
+        self._prefix_tier = np.array([tier for _, tier, _ in entries], dtype=np.int8)
+        self._prefix_ids = np.array([i for _, _, i in entries], dtype=np.int32)
+
+        grams = [trigrams(key) for key in keys]
+        self._gram_counts = np.array([len(g) for g in grams], dtype=np.int32)
+        pairs = pd.DataFrame({
+            "gram": [g for gs in grams for g in gs],
+            "id": np.repeat(np.arange(len(grams), dtype=np.int32), self._gram_counts),
+        })
+        codes, uniques = pd.factorize(pairs["gram"])
+        order = np.argsort(codes, kind="stable")
+        self._gram_codes = {gram: code for code, gram in enumerate(uniques)}
+        self._postings = pairs["id"].to_numpy()[order]
+        self._offsets = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+    def _prefix(self, key):
+        lo = bisect.bisect_left(self._prefix_keys, key)
+        hi = bisect.bisect_left(self._prefix_keys, key + _MAX_CHAR)
+        tiers = self._prefix_tier[lo:hi].copy()
+        # Whole-title exact matches outrank every other prefix match
+        exact = bisect.bisect_right(self._prefix_keys, key) - lo
+        tiers[:exact][tiers[:exact] == 0] = -1
+        return self._prefix_ids[lo:hi], tiers
+
+    def _fuzzy(self, key):
+        grams = trigrams(key)
+        query = [self._gram_codes[g] for g in grams if g in self._gram_codes]
+        if len(key) < MIN_FUZZY_LENGTH or not query:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        hits = np.concatenate([self._postings[self._offsets[c]:self._offsets[c + 1]] for c in query])
+        shared = np.bincount(hits, minlength=len(self.titles))
+        ids = np.flatnonzero(shared)
+        # Containment rather than Jaccard: a partial query should not be
+        # penalised for the rest of a long title
+        similarity = shared[ids] / len(grams)
+        keep = similarity >= MIN_SIMILARITY
+        return ids[keep], similarity[keep]
+
+    def search(self, query, limit=50):
+        """Up to `limit` titles matching `query`, best first."""
+        key = normalize(query)
+        if not key:
+            # Only an empty query lists popular titles; "!!!" matches nothing
+            return self.titles[self.by_popularity[:limit]] if not str(query).strip() else self.titles[:0]
+
+        ids, tiers = self._prefix(key)
+        # Best tier per title, then most reviewed
+        order = np.lexsort((-self.popularity[ids], tiers))
+        _, first = np.unique(ids[order], return_index=True)
+        ranked = ids[order][np.sort(first)]
+        if len(ranked) >= limit:
+            return self.titles[ranked[:limit]]
+
+        fuzzy, similarity = self._fuzzy(key)
+        fuzzy_mask = ~np.isin(fuzzy, ranked)
+        fuzzy, similarity = fuzzy[fuzzy_mask], similarity[fuzzy_mask]
+        fuzzy = fuzzy[np.lexsort((-self.popularity[fuzzy], -similarity))]
+        return self.titles[np.concatenate([ranked, fuzzy])[:limit]]
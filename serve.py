@@ -0,0 +1,234 @@
+"""Headless JSON prediction service.
+
+Loads the model and the catalog once and serves hit probabilities over HTTP
+without Streamlit.  Concurrent requests are coalesced into micro-batches: the
+first queued request opens a short window (a few ms), everything that arrives
+inside it is scored with one `predict_proba` call.
+
+    python serve.py --port 8000 --window-ms 2
+
+    POST /predict           {"rows": [[price_final, discount, ...], ...]}
+                            or {"rows": [{"price_final": ..., ...}, ...]}
+    POST /predict/by_title  {"title": "..."}
+    GET  /health
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+from catalog import TitleIndex
+from forest import FOREST_PATH, load_forest
+from registry import current_model, model_files
+from store import load_games
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+def load_model():
+    # The registry's current model; its compiled forest is the fast path
+    # for the small batches this serves
+    path = current_model()
+    if os.path.basename(path) == FOREST_PATH:
+        model = load_forest(path)
+        return model, model.features
+    model_file, features_file = model_files(path)
+    return joblib.load(model_file), joblib.load(features_file)
+
+
+class MicroBatcher:
+    """Coalesces concurrent `predict` calls into one `predict_proba` per window."""
+
+    def __init__(self, predict_proba, window_ms=2.0, max_batch=512):
+        self.predict_proba = predict_proba
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        # One model call at a time; the next batch fills while this one runs
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # A request that did not fit the last batch opens the next one
+        self.held = None
+        self.batches = 0
+        self.rows = 0
+
+    async def predict(self, X):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    async def _score(self, items):
+        X = np.concatenate([X for X, _ in items])
+        proba = await asyncio.get_running_loop().run_in_executor(self.executor, self.predict_proba, X)
+        self.batches += 1
+        self.rows += len(X)
+        start = 0
+        for X, future in items:
+            if not future.done():
+                future.set_result(proba[start:start + len(X)])
+            start += len(X)
+
+    async def run(self):
+        while True:
+            if self.held is not None:
+                items, self.held = [self.held], None
+            else:
+                items = [await self.queue.get()]
+            n_rows = len(items[0][0])
+            if n_rows < self.max_batch:
+                await asyncio.sleep(self.window)
+            # A single request larger than max_batch still goes through, alone
+            while not self.queue.empty():
+                item = self.queue.get_nowait()
+                if n_rows + len(item[0]) > self.max_batch:
+                    self.held = item
+                    break
+                items.append(item)
+                n_rows += len(item[0])
+
+            try:
+                await self._score(items)
+            except Exception as e:
+                if len(items) == 1:
+                    if not items[0][1].done():
+                        items[0][1].set_exception(e)
+                    continue
+                # One bad request must not fail the others it was batched with
+                for item in items:
+                    try:
+                        await self._score([item])
+                    except Exception as e:
+                        if not item[1].done():
+                            item[1].set_exception(e)
+
+
+class PredictionService:
+    def __init__(self, model, features, window_ms=2.0, max_batch=512):
+        self.model = model
+        self.features = list(features)
+        df = load_games(["title"] + self.features)
+        self.titles = TitleIndex(df["title"])
+        self.catalog = df[self.features].to_numpy(dtype=np.float32)
+        self.batcher = MicroBatcher(model.predict_proba, window_ms, max_batch)
+
+    def _rows(self, payload):
+        rows = payload.get("rows")
+        if not isinstance(rows, list) or not rows:
+            raise ValueError('expected a non-empty "rows" list')
+        if isinstance(rows[0], dict):
+            rows = [[row[f] for f in self.features] for row in rows]
+        X = np.asarray(rows, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise ValueError(f"each row needs {len(self.features)} values: {self.features}")
+        # Rejected here rather than failing the batch this request joins
+        if np.isinf(X).any():
+            raise ValueError("rows must not contain infinite or out-of-range values")
+        return X
+
+    def _result(self, proba):
+        hit = self.model.classes_.take(np.argmax(proba, axis=1))
+        return [{"prob": float(p), "hit": int(h)} for p, h in zip(proba[:, 1], hit)]
+
+    async def dispatch(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {
+                "status": "ok",
+                "features": self.features,
+                "games": len(self.catalog),
+                "batches": self.batcher.batches,
+                "rows": self.batcher.rows,
+            }
+        if method != "POST" or path not in ("/predict", "/predict/by_title"):
+            return 404, {"error": f"no route for {method} {path}"}
+
+        try:
+            payload = json.loads(body or b"{}")
+            if path == "/predict":
+                X = self._rows(payload)
+            else:
+                title = payload.get("title")
+                if title not in self.titles:
+                    return 404, {"error": f"unknown title: {title!r}"}
+                X = self.catalog[self.titles.position(title)][None, :]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return 400, {"error": str(e)}
+
+        results = self._result(await self.batcher.predict(X))
+        if path == "/predict/by_title":
+            return 200, {"title": title, **results[0]}
+        return 200, {"predictions": results}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, payload = await self.dispatch(method, target.split("?")[0], body)
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                head = [
+                    f"HTTP/1.1 {status} {REASONS[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(data)}",
+                ]
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, window_ms, max_batch):
+    start = time.perf_counter()
+    model, features = load_model()
+    service = PredictionService(model, features, window_ms, max_batch)
+    batcher = asyncio.create_task(service.batcher.run())
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"✅ Loaded model and {len(service.catalog):,} games in {time.perf_counter() - start:.2f}s")
+    print(f"✅ Serving on http://{host}:{port} (window {window_ms} ms, max batch {max_batch})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve hit probabilities over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--window-ms", type=float, default=2.0, help="micro-batch collection window")
+    parser.add_argument("--max-batch", type=int, default=512, help="rows per model call")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.window_ms, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
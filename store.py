@@ -0,0 +1,291 @@
+"""Typed columnar snapshot of games.csv.
+
+`python store.py` converts games.csv once into a directory of memory-mapped
+NumPy columns (bool/uint8/float32, titles as categorical codes).  Everything
+else calls `load_games()`, which reads the snapshot and only falls back to
+parsing the CSV when the snapshot is missing or older than the CSV.
+"""
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+CSV_PATH = "games.csv"
+STORE_DIR = "games_store"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+# Delta versions whose changed rows stay on record for incremental readers
+MAX_CHANGES = 20
+
+# Compact dtypes for the known games.csv columns
+SCHEMA = {
+    "app_id": "uint32",
+    "title": "category",
+    "date_release": "category",
+    "win": "bool",
+    "mac": "bool",
+    "linux": "bool",
+    "rating": "category",
+    "positive_ratio": "uint8",
+    "user_reviews": "uint32",
+    "price_final": "float32",
+    "price_original": "float32",
+    "discount": "uint8",
+    "steam_deck": "bool",
+}
+
+
+def _target_dtype(name, values):
+    if name in SCHEMA:
+        return SCHEMA[name]
+    if values.dtype == bool:
+        return "bool"
+    if values.dtype.kind in "iu":
+        return str(pd.to_numeric(values, downcast="integer").dtype)
+    if values.dtype.kind == "f":
+        return "float32"
+    return "category"
+
+
+def _compact_column(name, series):
+    dtype = _target_dtype(name, series)
+    if dtype == "category":
+        return series.astype("category")
+    values = series.to_numpy()
+    if dtype == "bool":
+        if values.dtype == bool:
+            return series
+        # Booleans with gaps come back as floats or strings from the CSV parser
+        if values.dtype.kind not in "iuf":
+            return series.astype("category")
+        dtype = "float32"
+    if np.dtype(dtype).kind in "iu":
+        info = np.iinfo(dtype)
+        numeric = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64")
+        fits = (
+            not np.isnan(numeric).any()
+            and (numeric == np.round(numeric)).all()
+            and (numeric.size == 0 or (numeric.min() >= info.min and numeric.max() <= info.max))
+        )
+        # Keep a float column rather than silently wrapping out-of-range values
+        if not fits:
+            dtype = "float32"
+    return series.astype(dtype)
+
+
+def compact_frame(df):
+    """Cast every column of a raw games frame to its compact dtype."""
+    return pd.DataFrame({name: _compact_column(name, df[name]) for name in df.columns})
+
+
+def _source_stat(csv_path):
+    try:
+        st = os.stat(csv_path)
+    except FileNotFoundError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def read_manifest(store_dir=STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def snapshot_is_fresh(csv_path=CSV_PATH, store_dir=STORE_DIR):
+    """True when the snapshot exists and the CSV has not changed since it was built."""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        return False
+    source = _source_stat(csv_path)
+    return source is None or source == manifest["source"]
+
+
+def dataset_version(csv_path=CSV_PATH, store_dir=STORE_DIR):
+    """Cheap identifier for the data `load_games()` would return right now."""
+    manifest = read_manifest(store_dir)
+    source = _source_stat(csv_path)
+    if manifest is not None and (source is None or source == manifest["source"]):
+        return f"snapshot-{manifest['version']}-{manifest['fingerprint']}"
+    if source is None:
+        return "missing"
+    return f"csv-{source['size']}-{source['mtime_ns']}"
+
+
+def _save_array(path, values):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, values)
+    os.replace(tmp, path)
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def write_snapshot(df, store_dir=STORE_DIR, source=None, version=1, changed=None):
+    """Write a compact frame as a versioned snapshot and swap the manifest in last.
+
+    `changed` lists the row positions that differ from the previous version;
+    it is logged so readers can refresh incrementally (see `changed_rows()`).
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    old = read_manifest(store_dir)
+    changes = []
+    if changed is not None and old is not None and old["version"] == version - 1:
+        rows_file = f"changes.v{version}.npy"
+        _save_array(os.path.join(store_dir, rows_file), np.unique(np.asarray(changed, dtype=np.int64)))
+        changes = old.get("changes", [])[-(MAX_CHANGES - 1):] + [{"version": version, "rows": rows_file}]
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        stem = f"{name}.v{version}"
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            _save_array(os.path.join(store_dir, stem + ".codes.npy"), series.cat.codes.to_numpy(dtype="int32"))
+            _write_json(os.path.join(store_dir, stem + ".categories.json"), [str(c) for c in series.cat.categories])
+            columns[name] = {"kind": "category", "file": stem}
+        else:
+            _save_array(os.path.join(store_dir, stem + ".npy"), series.to_numpy())
+            columns[name] = {"kind": "numeric", "file": stem, "dtype": str(series.dtype)}
+
+    digest = hashlib.sha1(json.dumps([source, version, len(df), list(columns)]).encode()).hexdigest()[:12]
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "fingerprint": digest,
+        "source": source,
+        "n_rows": len(df),
+        "columns": columns,
+        "changes": changes,
+    }
+    _write_json(os.path.join(store_dir, MANIFEST), manifest)
+
+    # Readers that already mapped the old files keep their pages after unlink
+    if old is not None and old["version"] != version:
+        stale = [spec["file"] + suffix for spec in old["columns"].values()
+                 for suffix in (".npy", ".codes.npy", ".categories.json")]
+        kept = {c["rows"] for c in changes}
+        stale += [c["rows"] for c in old.get("changes", []) if c["rows"] not in kept]
+        for name in stale:
+            try:
+                os.remove(os.path.join(store_dir, name))
+            except FileNotFoundError:
+                pass
+    return manifest
+
+
+def changed_rows(since_version, store_dir=STORE_DIR):
+    """Row positions updated or appended since snapshot version `since_version`.
+
+    Returns None when the change log does not reach back that far (e.g. the
+    snapshot was rebuilt from the CSV), in which case callers rebuild fully.
+    """
+    manifest = read_manifest(store_dir)
+    if manifest is None or since_version is None or since_version > manifest["version"]:
+        return None
+    logged = {c["version"]: c["rows"] for c in manifest.get("changes", [])}
+    rows = [np.empty(0, dtype=np.int64)]
+    for version in range(since_version + 1, manifest["version"] + 1):
+        if version not in logged:
+            return None
+        rows.append(np.load(os.path.join(store_dir, logged[version])))
+    return np.unique(np.concatenate(rows))
+
+
+def snapshot_version(csv_path=CSV_PATH, store_dir=STORE_DIR):
+    """Version number of the snapshot `load_games()` reads, or None for the CSV."""
+    if not snapshot_is_fresh(csv_path, store_dir):
+        return None
+    return read_manifest(store_dir)["version"]
+
+
+def build_snapshot(csv_path=CSV_PATH, store_dir=STORE_DIR):
+    """One-time conversion of games.csv into the columnar snapshot."""
+    source = _source_stat(csv_path)
+    df = compact_frame(pd.read_csv(csv_path))
+    old = read_manifest(store_dir)
+    version = old["version"] + 1 if old is not None else 1
+    return write_snapshot(df, store_dir, source=source, version=version)
+
+
+def _open_column(store_dir, spec):
+    # Returns the memory-mapped values and, for categoricals, their dtype
+    path = os.path.join(store_dir, spec["file"])
+    if spec["kind"] == "category":
+        codes = np.load(path + ".codes.npy", mmap_mode="r")
+        with open(path + ".categories.json") as f:
+            return codes, pd.CategoricalDtype(json.load(f))
+    return np.load(path + ".npy", mmap_mode="r"), None
+
+
+def _column_slice(column, start=None, stop=None):
+    values, dtype = column
+    values = values[start:stop]
+    if dtype is None:
+        return values
+    return pd.Categorical.from_codes(values, dtype=dtype)
+
+
+def _check_columns(columns, available):
+    missing = [c for c in columns if c not in available]
+    if missing:
+        raise ValueError(f"Columns not found in games data: {missing}")
+
+
+def _open_snapshot(columns, store_dir):
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(os.path.join(store_dir, MANIFEST))
+    specs = manifest["columns"]
+    columns = list(specs) if columns is None else list(columns)
+    _check_columns(columns, specs)
+    return manifest["n_rows"], {name: _open_column(store_dir, specs[name]) for name in columns}
+
+
+def read_snapshot(columns=None, store_dir=STORE_DIR):
+    _, opened = _open_snapshot(columns, store_dir)
+    return pd.DataFrame({name: _column_slice(column) for name, column in opened.items()})
+
+
+def load_games(columns=None, csv_path=CSV_PATH, store_dir=STORE_DIR):
+    """Load the games table, only the requested columns, from the freshest source."""
+    if snapshot_is_fresh(csv_path, store_dir):
+        return read_snapshot(columns, store_dir)
+    df = pd.read_csv(csv_path, usecols=columns)
+    return compact_frame(df if columns is None else df[list(columns)])
+
+
+def iter_games(columns=None, chunksize=100_000, csv_path=CSV_PATH, store_dir=STORE_DIR):
+    """Yield the games table in frames of at most `chunksize` rows.
+
+    Snapshot chunks are slices of the memory-mapped columns and CSV chunks are
+    parsed incrementally, so memory stays bounded by the chunk size.
+    """
+    if snapshot_is_fresh(csv_path, store_dir):
+        n_rows, opened = _open_snapshot(columns, store_dir)
+        for start in range(0, n_rows, chunksize):
+            stop = min(start + chunksize, n_rows)
+            yield pd.DataFrame(
+                {name: _column_slice(column, start, stop) for name, column in opened.items()},
+                index=pd.RangeIndex(start, stop),
+            )
+        return
+    for chunk in pd.read_csv(csv_path, usecols=columns, chunksize=chunksize):
+        yield compact_frame(chunk if columns is None else chunk[list(columns)])
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    manifest = build_snapshot(csv_path)
+    print(f"✅ Saved {manifest['n_rows']:,} rows x {len(manifest['columns'])} columns to {STORE_DIR}/")
@@ -0,0 +1,97 @@
+"""Out-of-core training for catalogs larger than RAM.
+
+Streams the games table chunk by chunk (`iter_games`), puts every row on the
+train or test side by hashing its app_id, and fits an incrementally trained
+linear model, so memory is bounded by `--chunksize` instead of the catalog.
+
+    python stream_train.py --chunksize 100000 --epochs 5
+
+Pass 1 fits the scaler, then each epoch runs `partial_fit` over the train
+chunks; a last pass scores the test chunks.  The result is a regular sklearn
+Pipeline saved as model.pkl and published to the model registry, so the app
+and predictions.py use it as is.
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
+
+from registry import publish
+from store import dataset_version, iter_games, snapshot_version
+from train import SPLIT, features, peak_rss_mb, test_mask, write_model_metadata
+
+
+def iter_split(test, chunksize, seed=None):
+    """(X, y) per chunk for one side of the split; shuffled within chunks given a seed."""
+    rng = np.random.default_rng(seed)
+    for chunk in iter_games(["app_id", "positive_ratio"] + features, chunksize=chunksize):
+        chunk = chunk[test_mask(chunk["app_id"].to_numpy()) == test]
+        if seed is not None:
+            chunk = chunk.iloc[rng.permutation(len(chunk))]
+        # Hit = good rating + enough reviews
+        y = ((chunk["positive_ratio"] >= 85) & (chunk["user_reviews"] >= 500)).astype(int).to_numpy()
+        yield chunk[features].astype(np.float32), y
+
+
+def fit_streaming(chunksize=100_000, epochs=5):
+    """Scaler + SGD logistic regression fitted chunk by chunk; returns the Pipeline."""
+    # Prices and review counts are heavy-tailed; every feature is >= 0
+    log = FunctionTransformer(np.log1p, feature_names_out="one-to-one")
+    scaler = StandardScaler()
+    for X, _ in iter_split(False, chunksize):
+        scaler.partial_fit(log.fit_transform(X))
+
+    model = SGDClassifier(loss="log_loss", random_state=42)
+    for epoch in range(epochs):
+        for X, y in iter_split(False, chunksize, seed=epoch):
+            if len(X):
+                model.partial_fit(scaler.transform(log.transform(X)), y, classes=[0, 1])
+    return Pipeline([("log", log), ("scale", scaler), ("model", model)])
+
+
+def evaluate_streaming(model, chunksize=100_000):
+    """Accuracy and F1 of the hit class over the streamed test side."""
+    counts = np.zeros((2, 2), dtype=np.int64)
+    for X, y in iter_split(True, chunksize):
+        if len(X):
+            np.add.at(counts, (y, model.predict(X)), 1)
+    (tn, fp), (fn, tp) = counts
+    accuracy = (tn + tp) / max(counts.sum(), 1)
+    f1 = 2 * tp / max(2 * tp + fp + fn, 1)
+    return accuracy, f1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train in bounded memory by streaming the catalog.")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows held in memory at once")
+    parser.add_argument("--epochs", type=int, default=5, help="passes over the train side")
+    parser.add_argument("--output", default="model.pkl")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = fit_streaming(args.chunksize, args.epochs)
+    fit_time = time.perf_counter() - start
+    accuracy, f1 = evaluate_streaming(model, args.chunksize)
+    print("✅ Accuracy:", accuracy, "| F1:", round(f1, 4))
+
+    joblib.dump(model, args.output + ".tmp")
+    joblib.dump(features, "features.pkl")
+    os.replace(args.output + ".tmp", args.output)
+    print(f"✅ Fit time: {fit_time:.2f}s | Peak RSS: {peak_rss_mb():.0f} MB")
+    print(f"✅ Saved {args.output} and features.pkl")
+    # Registry versions are built from ./model.pkl (see registry.publish)
+    if args.output == "model.pkl":
+        metrics = {"accuracy": accuracy, "f1": f1, "fit_seconds": fit_time}
+        write_model_metadata({"dataset_version": dataset_version(), "store_version": snapshot_version(),
+                              "split": SPLIT, **metrics})
+        version = publish(metrics)
+        print(f"✅ Published registry version {version}")
+
+
+if __name__ == "__main__":
+    main()
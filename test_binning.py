@@ -0,0 +1,77 @@
+"""Feature binning (binning.py): edges, the NaN bin and the stored matrix."""
+import numpy as np
+import pandas as pd
+
+from binning import MAX_BINS, MISSING_BIN, Binner, apply_edges, build_bins, compute_edges, load_bins
+from store import build_snapshot, read_snapshot
+
+FEATURES = ["price_final", "discount", "win", "user_reviews"]
+
+
+def test_few_values_get_one_bin_each():
+    values = np.array([0, 10, 10, 50, np.nan, 0])
+    edges = compute_edges(values)
+    assert edges.tolist() == [5.0, 30.0]
+    binned = apply_edges(values[:, None], [edges])[:, 0]
+    assert binned.tolist() == [0, 1, 1, 2, MISSING_BIN, 0]
+
+
+def test_edges_split_between_values():
+    # Edges are midpoints; a value on an edge goes to the upper bin, and
+    # values outside the fitted range land in the first or last bin
+    edges = compute_edges([1.0, 2.0, 4.0])
+    assert edges.tolist() == [1.5, 3.0]
+    X = np.array([[-100.0], [1.0], [1.5], [1.6], [2.0], [2.9], [3.0], [4.0], [1e9]])
+    assert apply_edges(X, [edges])[:, 0].tolist() == [0, 0, 1, 1, 1, 1, 2, 2, 2]
+
+
+def test_many_values_get_quantile_bins():
+    rng = np.random.default_rng(0)
+    values = rng.pareto(1.2, 50_000)
+    values[::100] = np.nan
+    edges = compute_edges(values)
+    assert len(edges) <= MAX_BINS - 1 and np.all(np.diff(edges) > 0)
+
+    binned = apply_edges(values[:, None], [edges])[:, 0]
+    assert np.array_equal(binned == MISSING_BIN, np.isnan(values))
+    assert binned[binned != MISSING_BIN].max() == len(edges)
+    # Roughly equal-sized bins
+    counts = np.bincount(binned[binned != MISSING_BIN])
+    assert counts.max() < 3 * len(values) / MAX_BINS
+    # Order preserving
+    present = ~np.isnan(values)
+    order = np.argsort(values[present])
+    assert np.all(np.diff(binned[present][order].astype(int)) >= 0)
+
+
+def test_all_nan_column():
+    edges = compute_edges([np.nan, np.nan])
+    assert len(edges) == 0
+    assert apply_edges(np.array([[np.nan], [3.0]]), [edges])[:, 0].tolist() == [MISSING_BIN, 0]
+
+
+def test_binner_picks_columns_by_name():
+    df = pd.DataFrame({"a": [1.0, 2.0, np.nan], "b": [5, 5, 6]})
+    binner = Binner().fit(df)
+    assert binner.features == ["a", "b"]
+    reordered = df[["b", "a"]].assign(c=0)
+    assert np.array_equal(binner.transform(reordered), [[0, 0], [1, 0], [MISSING_BIN, 1]])
+
+
+def test_build_and_load_bins(games):
+    build_snapshot()
+    binned, binner = build_bins(FEATURES, chunksize=64)
+    df = read_snapshot(FEATURES)
+    assert binned.dtype == np.uint8 and binned.shape == (len(games), len(FEATURES))
+    assert np.array_equal(binned, binner.transform(df))
+    # One bin per distinct value for the low-cardinality columns
+    assert len(np.unique(binned[:, FEATURES.index("discount")])) == games["discount"].nunique()
+    assert len(np.unique(binned[:, FEATURES.index("win")])) == 2
+
+    loaded, loaded_binner = load_bins(FEATURES)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, binned)
+    assert all(np.array_equal(a, b) for a, b in zip(loaded_binner.edges, binner.edges))
+    # A different feature list is rebuilt rather than read back
+    rebuilt, _ = load_bins(FEATURES[:2])
+    assert rebuilt.shape == (len(games), 2)
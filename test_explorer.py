@@ -0,0 +1,79 @@
+"""FilterIndex (explorer.py) bitmaps and pages against plain pandas masks."""
+import numpy as np
+import pytest
+
+from conftest import make_games
+from explorer import FLAGS, RANGES, FilterIndex
+
+
+@pytest.fixture(scope="module")
+def df():
+    # 403 rows: the last bitmap byte is partly padding
+    games = make_games(403)
+    # Ties on every sort key, so paging has to follow the stable order
+    games["user_reviews"] = games["user_reviews"] % 50 * 20
+    return games
+
+
+@pytest.fixture(scope="module")
+def index(df):
+    return FilterIndex(df)
+
+
+def flag_mask(df, name):
+    if name == "hit":
+        return ((df["positive_ratio"] >= 85) & (df["user_reviews"] >= 500)).to_numpy()
+    return df[name].to_numpy(dtype=bool)
+
+
+def range_mask(df, name, low, high):
+    values = df[RANGES[name]]
+    return ((low is None or values >= low) & (high is None or values <= high)).to_numpy()
+
+
+@pytest.mark.parametrize("name", FLAGS)
+def test_flag_counts(df, index, name):
+    mask = flag_mask(df, name)
+    assert index.count(index.flag(name)) == mask.sum()
+    assert np.array_equal(index.rows(index.flag(name)), np.flatnonzero(mask))
+
+
+@pytest.mark.parametrize("name, low, high", [
+    ("price", 4.99, 19.99), ("price", None, 0.0), ("discount", 10, None),
+    ("rating", 50, 85), ("reviews", 500, None), ("reviews", 2000, 10),
+])
+def test_range_counts(df, index, name, low, high):
+    mask = range_mask(df, name, low, high)
+    assert index.range_count(name, low, high) == mask.sum()
+    assert index.count(index.range(name, low, high)) == mask.sum()
+    assert np.array_equal(index.rows(index.range(name, low, high)), np.flatnonzero(mask))
+
+
+@pytest.mark.parametrize("match_all", [True, False])
+def test_combine(df, index, match_all):
+    bitmaps = [index.flag("mac"), index.flag("hit"), index.range("price", None, 9.99)]
+    masks = [flag_mask(df, "mac"), flag_mask(df, "hit"), range_mask(df, "price", None, 9.99)]
+    expected = np.logical_and.reduce(masks) if match_all else np.logical_or.reduce(masks)
+    combined = index.combine(bitmaps, match_all)
+    assert index.count(combined) == expected.sum()
+    assert np.array_equal(index.rows(combined), np.flatnonzero(expected))
+    assert index.count(index.combine([])) == len(df)
+
+
+@pytest.mark.parametrize("sort_by", list(RANGES))
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_follow_the_pandas_sort(df, index, sort_by, descending):
+    bitmap = index.combine([index.flag("win"), index.range("rating", 40, None)])
+    matches = df[flag_mask(df, "win") & range_mask(df, "rating", 40, None)]
+    # A stable sort on the column; descending reverses the ascending order
+    order = matches.sort_values(RANGES[sort_by], kind="stable").index.to_numpy()
+    if descending:
+        order = order[::-1]
+
+    pages = []
+    for page in range(len(matches) // 40 + 2):
+        rows = index.page(bitmap, sort_by, descending, page=page, page_size=40)
+        assert len(rows) <= 40
+        pages.append(rows)
+    assert len(pages[-1]) == 0
+    assert np.array_equal(np.concatenate(pages), order)
@@ -0,0 +1,100 @@
+"""Parity tests for the NumPy forest engine against sklearn's predict_proba.
+
+    python -m pytest test_forest.py
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+from forest import compile_forest, load_forest, save_forest
+
+
+def make_data(n_rows=600, n_features=6, n_classes=2, nan_share=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features)).astype(np.float32)
+    # Repeated values put rows exactly on split thresholds
+    X[:, 0] = np.round(X[:, 0], 1)
+    y = (X[:, 0] + X[:, 1] * X[:, 2] > 0).astype(int) + (n_classes > 2) * (X[:, 3] > 0.5)
+    if nan_share:
+        X[rng.random(X.shape) < nan_share] = np.nan
+    features = [f"f{i}" for i in range(n_features)]
+    return X, y, features
+
+
+def fit(estimator, X, y, **params):
+    return estimator(n_estimators=25, random_state=0, n_jobs=1, **params).fit(X, y)
+
+
+@pytest.mark.parametrize("estimator", [RandomForestClassifier, ExtraTreesClassifier])
+def test_binary_parity(estimator):
+    X, y, features = make_data()
+    model = fit(estimator, X, y)
+    compiled = compile_forest(model, features)
+    X_new, _, _ = make_data(seed=1)
+    assert np.array_equal(compiled.predict_proba(X_new), model.predict_proba(X_new))
+    assert np.array_equal(compiled.predict(X_new), model.predict(X_new))
+
+
+def test_multiclass_parity():
+    X, y, features = make_data(n_classes=3)
+    assert len(np.unique(y)) == 3
+    model = fit(RandomForestClassifier, X, y, max_depth=8)
+    compiled = compile_forest(model, features)
+    assert np.array_equal(compiled.classes_, model.classes_)
+    assert np.array_equal(compiled.predict_proba(X), model.predict_proba(X))
+
+
+def test_nan_parity():
+    X, y, features = make_data(nan_share=0.1)
+    model = fit(RandomForestClassifier, X, y)
+    compiled = compile_forest(model, features)
+    X_new, _, _ = make_data(nan_share=0.2, seed=1)
+    assert np.isnan(X_new).any()
+    assert np.array_equal(compiled.predict_proba(X_new), model.predict_proba(X_new))
+
+
+def test_block_boundaries():
+    # More rows than one traversal block, and a single row
+    X, y, features = make_data(n_rows=5000)
+    model = fit(RandomForestClassifier, X, y, min_samples_leaf=3)
+    compiled = compile_forest(model, features)
+    assert len(X) > compiled.block_size
+    assert np.array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(compiled.predict_proba(X[:1]), model.predict_proba(X[:1]))
+
+
+def test_save_load_round_trip(tmp_path):
+    X, y, features = make_data(n_classes=3, nan_share=0.05)
+    model = fit(RandomForestClassifier, X, y)
+    path = save_forest(model, features, str(tmp_path / "model.forest"), metadata={"accuracy": 0.5})
+
+    loaded = load_forest(path)
+    assert isinstance(loaded.value, np.memmap) or isinstance(loaded.value.base, np.memmap)
+    assert loaded.features == features
+    assert loaded.n_estimators == 25
+    assert not loaded.quantized
+    assert loaded.metadata == {"accuracy": 0.5}
+    assert np.array_equal(loaded.classes_, model.classes_)
+    assert np.array_equal(loaded.feature_importances_, model.feature_importances_)
+    assert np.array_equal(loaded.predict_proba(X), model.predict_proba(X))
+
+
+def test_quantized_round_trip(tmp_path):
+    X, y, features = make_data()
+    model = fit(RandomForestClassifier, X, y)
+    path = save_forest(model, features, str(tmp_path / "model.forest"), quantize=True)
+
+    loaded = load_forest(path)
+    assert loaded.quantized
+    assert loaded.value.dtype == np.float16
+    # Same leaves as the exact engine; only the stored leaf values are rounded
+    exact = compile_forest(model, features)
+    assert np.array_equal(loaded._leaves(X), exact._leaves(X))
+    assert np.allclose(loaded.predict_proba(X), model.predict_proba(X), atol=1e-3)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"not a forest")
+    with pytest.raises(ValueError):
+        load_forest(str(path))
@@ -0,0 +1,105 @@
+"""Delta ingest (ingest.py) against a snapshot built from a synthetic games.csv."""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from catalog import Catalog, MarketStats, TitleIndex
+from conftest import make_games
+from ingest import merge_delta
+from predictions import build_predictions
+from store import build_snapshot, changed_rows, read_manifest, read_snapshot
+
+FEATURES = ["price_final", "discount", "win", "mac", "linux", "steam_deck", "user_reviews"]
+
+
+def read_delta(text):
+    # Parsed like `python ingest.py delta.csv` parses it
+    return pd.read_csv(io.StringIO(text))
+
+
+def mixed_delta(games):
+    """Three partial updates with blank cells plus two complete new games."""
+    new = make_games(2, seed=1, first_id=10_000)
+    updates = pd.DataFrame({"app_id": games["app_id"].iloc[[0, 1, 2]].to_numpy()})
+    updates["price_final"] = [1.99, np.nan, 3.99]
+    updates["steam_deck"] = [np.nan, not games["steam_deck"].iloc[1], np.nan]
+    updates["positive_ratio"] = [np.nan, np.nan, 42]
+    return pd.concat([updates, new], ignore_index=True)[new.columns], new
+
+
+def test_mixed_delta_keeps_dtypes_and_values(games):
+    build_snapshot()
+    before = read_snapshot()
+    delta, new = mixed_delta(games)
+    manifest, n_updated, n_appended = merge_delta(read_delta(delta.to_csv(index=False)))
+
+    after = read_snapshot()
+    assert (n_updated, n_appended) == (3, 2)
+    assert manifest["n_rows"] == len(games) + 2
+    # Same dtypes (categoricals may gain categories)
+    assert after.dtypes.astype(str).to_dict() == before.dtypes.astype(str).to_dict()
+
+    # Blank cells leave the stored values alone
+    assert after["price_final"].iloc[:3].tolist() == pytest.approx([1.99, before["price_final"].iloc[1], 3.99])
+    assert after["steam_deck"].iloc[:3].tolist() == [
+        before["steam_deck"].iloc[0], not games["steam_deck"].iloc[1], before["steam_deck"].iloc[2],
+    ]
+    assert after["positive_ratio"].iloc[:3].tolist() == [*before["positive_ratio"].iloc[:2], 42]
+    pd.testing.assert_frame_equal(after.iloc[3:len(games)].astype(object), before.iloc[3:].astype(object))
+    assert after["title"].iloc[-2:].tolist() == new["title"].tolist()
+    assert after["app_id"].iloc[-2:].tolist() == new["app_id"].tolist()
+    assert changed_rows(manifest["version"] - 1).tolist() == [0, 1, 2, len(games), len(games) + 1]
+
+
+def test_predictions_build_after_mixed_delta(games):
+    build_snapshot()
+    merge_delta(read_delta(mixed_delta(games)[0].to_csv(index=False)))
+
+    X = games[FEATURES].astype(np.float32)
+    y = games["positive_ratio"] >= 80
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    proba = build_predictions(model, FEATURES)
+    assert proba.shape == (len(games) + 2, 2)
+    assert not np.isnan(proba).any()
+
+
+def test_new_rows_need_every_value(games):
+    build_snapshot()
+    new = make_games(1, seed=2, first_id=20_000)
+    new["steam_deck"] = new["steam_deck"].astype(object)
+    new.loc[0, "steam_deck"] = np.nan
+    with pytest.raises(ValueError, match="steam_deck"):
+        merge_delta(read_delta(new.to_csv(index=False)))
+    assert read_manifest()["version"] == 1
+
+
+def test_values_must_fit_the_column(games):
+    build_snapshot()
+    for column, value in (("win", "maybe"), ("positive_ratio", 300), ("discount", 12.5)):
+        delta = pd.DataFrame({"app_id": [games["app_id"].iloc[0]], column: [value]})
+        with pytest.raises(ValueError, match=column):
+            merge_delta(read_delta(delta.to_csv(index=False)))
+    assert read_manifest()["version"] == 1
+
+
+def test_catalog_refresh_matches_full_rebuild(games):
+    build_snapshot()
+    columns = ["title", "price_final", "user_reviews", "positive_ratio"]
+    catalog = Catalog(columns)
+    catalog.refresh()
+
+    delta, _ = mixed_delta(games)
+    delta.loc[0, "title"] = games["title"].iloc[5]  # a rename onto an existing title
+    merge_delta(read_delta(delta.to_csv(index=False)))
+    state = catalog.refresh()
+
+    df = read_snapshot(columns)
+    full = MarketStats(df)
+    assert np.array_equal(state.market.reviews, full.reviews)
+    assert np.array_equal(state.market.prices, full.prices)
+    assert state.market.rating_mean == pytest.approx(full.rating_mean)
+    titles = TitleIndex(df["title"])
+    assert state.titles._positions == titles._positions
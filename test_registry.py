@@ -0,0 +1,101 @@
+"""Model registry (registry.py) and the prediction sidecars it keeps alive."""
+import glob
+import json
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from predictions import load_predictions, model_version
+from registry import (KEEP_VERSIONS, current_model, model_files, promote, publish, read_manifest,
+                      rollback)
+from store import dataset_version
+
+FEATURES = ["price_final", "discount", "win", "mac", "linux", "steam_deck", "user_reviews"]
+
+
+def train_and_publish(games, n_estimators=3, **kwargs):
+    """Writes model.pkl + features.pkl like train.py, then publishes them."""
+    X = games[FEATURES].astype(np.float32)
+    y = games["positive_ratio"] >= 80
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=0).fit(X, y)
+    joblib.dump(model, "model.pkl")
+    joblib.dump(FEATURES, "features.pkl")
+    return publish({"accuracy": 0.5}, **kwargs)
+
+
+def test_publish_promote_rollback(games):
+    assert [train_and_publish(games, n) for n in (2, 3, 4)] == ["v0001", "v0002", "v0003"]
+    manifest = read_manifest()
+    assert (manifest["current"], manifest["previous"]) == ("v0003", "v0002")
+    assert manifest["versions"]["v0002"]["features"] == FEATURES
+    assert manifest["versions"]["v0002"]["metrics"] == {"accuracy": 0.5}
+    assert current_model() == os.path.join("models", "v0003", "model.pkl")
+    assert joblib.load(model_files(current_model())[0]).n_estimators == 4
+
+    manifest = rollback()
+    assert (manifest["current"], manifest["previous"]) == ("v0002", "v0003")
+    assert read_manifest() == manifest
+    assert joblib.load(model_files(current_model())[0]).n_estimators == 3
+
+    promote("v0001")
+    assert (read_manifest()["current"], read_manifest()["previous"]) == ("v0001", "v0002")
+    with pytest.raises(KeyError):
+        promote("v0042")
+
+
+def test_publish_without_promote(games):
+    train_and_publish(games)
+    assert train_and_publish(games, promote_version=False) == "v0002"
+    manifest = read_manifest()
+    assert (manifest["current"], manifest["previous"]) == ("v0001", None)
+    with pytest.raises(KeyError):
+        rollback()
+
+
+def test_prune_keeps_current_previous_and_newest(games):
+    train_and_publish(games)
+    train_and_publish(games)
+    for _ in range(KEEP_VERSIONS + 2):
+        train_and_publish(games, promote_version=False)
+
+    manifest = read_manifest()
+    assert (manifest["current"], manifest["previous"]) == ("v0002", "v0001")
+    # v0003 and v0004 fell out of the newest five; current and previous are always kept
+    kept = ["v0001", "v0002"] + [f"v{i:04d}" for i in range(5, KEEP_VERSIONS + 5)]
+    assert sorted(manifest["versions"]) == kept
+    assert sorted(os.listdir("models")) == sorted(kept + ["manifest.json"])
+
+
+def test_sidecars_of_the_previous_model_survive(games):
+    def publish_and_predict(n_estimators):
+        train_and_publish(games, n_estimators)
+        return predict()
+
+    def predict():
+        path = current_model()
+        model = joblib.load(model_files(path)[0])
+        load_predictions(model, FEATURES, model_version(path), dataset_version())
+        return model_version(path)
+
+    def sidecar_models():
+        versions = set()
+        for path in glob.glob(os.path.join("predictions", "proba-*.json")):
+            with open(path) as f:
+                versions.add(json.load(f)["model_version"])
+        return versions
+
+    first = publish_and_predict(2)
+    second = publish_and_predict(3)
+    assert sidecar_models() == {first, second}
+
+    # The first model is neither current nor previous any more
+    third = publish_and_predict(4)
+    assert sidecar_models() == {second, third}
+
+    # A rollback reuses the kept sidecar
+    rollback()
+    assert predict() == second
+    assert sidecar_models() == {second, third}
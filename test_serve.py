@@ -0,0 +1,64 @@
+"""MicroBatcher (serve.py): batch limits and isolation of failing requests."""
+import asyncio
+
+import numpy as np
+import pytest
+
+from serve import MicroBatcher
+
+
+class FakeModel:
+    """predict_proba that records batch sizes and rejects rows with a negative value."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_proba(self, X):
+        self.batches.append(len(X))
+        if (X < 0).any():
+            raise ValueError("negative value")
+        return np.column_stack([1 - X[:, 0], X[:, 0]])
+
+
+async def predict_all(batcher, requests):
+    runner = asyncio.create_task(batcher.run())
+    try:
+        return await asyncio.gather(*[batcher.predict(X) for X in requests], return_exceptions=True)
+    finally:
+        runner.cancel()
+
+
+def rows(n, value=0.5):
+    return np.full((n, 2), value, dtype=np.float32)
+
+
+def test_bad_request_only_fails_itself():
+    model = FakeModel()
+    batcher = MicroBatcher(model.predict_proba, window_ms=20, max_batch=100)
+    results = asyncio.run(predict_all(batcher, [rows(2, 0.25), rows(1, -1.0), rows(3, 0.75)]))
+
+    assert isinstance(results[1], ValueError)
+    assert np.array_equal(results[0][:, 1], [0.25, 0.25])
+    assert np.array_equal(results[2][:, 1], [0.75] * 3)
+
+
+def test_batches_stay_within_max_batch():
+    model = FakeModel()
+    batcher = MicroBatcher(model.predict_proba, window_ms=20, max_batch=10)
+    requests = [rows(4), rows(4), rows(4), rows(15), rows(1)]
+    results = asyncio.run(predict_all(batcher, requests))
+
+    assert [len(r) for r in results] == [4, 4, 4, 15, 1]
+    # Only a request that is larger than max_batch on its own exceeds it
+    assert all(n <= 10 for n in model.batches if n != 15)
+    assert sum(model.batches) == 28
+    assert batcher.rows == 28
+
+
+@pytest.mark.parametrize("max_batch", [1, 512])
+def test_results_keep_request_order(max_batch):
+    model = FakeModel()
+    batcher = MicroBatcher(model.predict_proba, window_ms=5, max_batch=max_batch)
+    values = np.linspace(0, 1, 20, dtype=np.float32)
+    results = asyncio.run(predict_all(batcher, [rows(1, v) for v in values]))
+    assert np.array_equal(np.concatenate(results)[:, 1], values)
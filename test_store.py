@@ -0,0 +1,71 @@
+"""Columnar snapshot (store.py): dtypes, round trips and the stale-CSV fallback."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_games
+from store import (SCHEMA, build_snapshot, changed_rows, dataset_version, iter_games, load_games,
+                   read_manifest, read_snapshot, snapshot_is_fresh, snapshot_version)
+
+
+def test_snapshot_round_trip(games):
+    assert not snapshot_is_fresh()
+    manifest = build_snapshot()
+    assert manifest["n_rows"] == len(games)
+    assert snapshot_is_fresh() and snapshot_version() == 1
+
+    df = read_snapshot()
+    assert {name: str(dtype) for name, dtype in df.dtypes.items()} == SCHEMA
+    pd.testing.assert_frame_equal(df.astype(object), games.astype(df.dtypes).astype(object))
+    assert np.array_equal(df["price_final"], games["price_final"].astype(np.float32))
+    assert isinstance(load_games(["title", "win"])["title"].dtype, pd.CategoricalDtype)
+
+
+def test_iter_games_matches_load_games(games):
+    build_snapshot()
+    columns = ["app_id", "title", "price_final"]
+    chunks = list(iter_games(columns, chunksize=150))
+    assert [len(c) for c in chunks] == [150, 150, 100]
+    pd.testing.assert_frame_equal(pd.concat(chunks).astype(object), load_games(columns).astype(object))
+
+
+def test_unknown_columns_are_rejected(games):
+    build_snapshot()
+    with pytest.raises(ValueError, match="metacritic"):
+        read_snapshot(["title", "metacritic"])
+
+
+def test_stale_snapshot_falls_back_to_the_csv(games):
+    build_snapshot()
+    version = dataset_version()
+    assert version.startswith("snapshot-1-")
+
+    changed = make_games(len(games), seed=3)
+    changed.to_csv("games.csv", index=False)
+    # A CSV written within the same mtime tick still differs in size or mtime
+    os.utime("games.csv", ns=(0, os.stat("games.csv").st_mtime_ns + 1))
+
+    assert not snapshot_is_fresh()
+    assert snapshot_version() is None
+    assert dataset_version().startswith("csv-")
+    df = load_games(["positive_ratio", "title"])
+    assert df["positive_ratio"].tolist() == changed["positive_ratio"].tolist()
+    assert str(df["positive_ratio"].dtype) == SCHEMA["positive_ratio"]
+    assert sum(map(len, iter_games(["title"], chunksize=100))) == len(changed)
+
+    # Rebuilding picks the new CSV up as the next version, without a change log
+    assert build_snapshot()["version"] == 2
+    assert snapshot_is_fresh() and dataset_version() != version
+    assert read_snapshot(["positive_ratio"])["positive_ratio"].tolist() == changed["positive_ratio"].tolist()
+    assert changed_rows(1) is None
+
+
+def test_rebuild_removes_old_column_files(games):
+    build_snapshot()
+    build_snapshot()
+    files = os.listdir("games_store")
+    assert not any(".v1." in name for name in files)
+    assert all(name.startswith(tuple(SCHEMA)) or name == "manifest.json" for name in files)
+    assert read_manifest()["version"] == 2
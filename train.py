@@ -1,36 +1,292 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score
-import joblib
+import argparse
+import json
+import os
+import sys
+import time
 
-# Load dataset
-df = pd.read_csv("games.csv")
+import joblib
+import numpy as np
+import sklearn
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.pipeline import Pipeline
 
-# ✅ Create target: HIT game or not
-# Hit = good rating + enough reviews
-df["hit"] = ((df["positive_ratio"] >= 85) & (df["user_reviews"] >= 500)).astype(int)
+from binning import load_bins
+from forest import FOREST_PATH, forest_is_fresh, load_forest, save_forest
+from registry import MODEL_METADATA, current_model, model_files, publish
+from store import _write_json, changed_rows, dataset_version, load_games, snapshot_version
+from tuning import candidates, format_table, search
 
 # ✅ Features for model
 features = ["price_final", "discount", "win", "mac", "linux", "steam_deck", "user_reviews"]
-X = df[features]
-y = df["hit"]
+# Rows held out for evaluation, picked by a hash of app_id (see test_mask)
+TEST_SHARE = 0.2
+_BUCKETS = 10_000
+# Recorded with every model, so --refresh only compares models on the same split
+SPLIT = "app_id-splitmix64"
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (NaN where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+
+
+def hit_labels(df):
+    # ✅ Create target: HIT game or not
+    # Hit = good rating + enough reviews
+    return ((df["positive_ratio"] >= 85) & (df["user_reviews"] >= 500)).astype(int)
+
+
+def _mix64(ids):
+    # splitmix64 finalizer: consecutive app_ids land in unrelated buckets
+    z = ids.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def test_mask(app_ids, test_share=TEST_SHARE):
+    """True for rows on the test side; depends only on each row's app_id."""
+    return _mix64(np.asarray(app_ids)) % np.uint64(_BUCKETS) < round(test_share * _BUCKETS)
+
+
+def load_split():
+    # Load dataset (snapshot if fresh, else games.csv)
+    df = load_games(["app_id"] + features + ["positive_ratio"])
+    y = hit_labels(df)
+
+    # Compact float32 inputs: the trees split on float32 anyway
+    X = df[features].astype(np.float32)
+
+    # Split by app_id: a game stays on its side when rows are ingested, so a
+    # refreshed model is scored on rows the current model never trained on
+    test = test_mask(df["app_id"].to_numpy())
+    return X[~test], X[test], y[~test], y[test]
+
+
+def load_binned_split():
+    """Same rows as `load_split()`, as uint8 bins (binning.py) plus the Binner."""
+    binned, binner = load_bins(features)
+    df = load_games(["app_id", "positive_ratio", "user_reviews"])
+    y = hit_labels(df).to_numpy()
+    test = test_mask(df["app_id"].to_numpy())
+    return binned[~test], binned[test], y[~test], y[test], binner
+
+
+def save_model(model, quantize=False, metadata=None):
+    """Write model.pkl, features.pkl, model.json and (for forests) model.forest, each swapped in atomically.
+
+    The result is then published as a new registry version, whose name is returned.
+
+    The forest is written after the pickle's temp file, so it is never older
+    than the model.pkl that replaces the old one (see `forest_is_fresh()`).
+    """
+    metrics = metadata or {}
+    metadata = {
+        "dataset_version": dataset_version(),
+        "store_version": snapshot_version(),
+        "sklearn": sklearn.__version__,
+        "split": SPLIT,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **metrics,
+    }
+    # Single-row predictions in the app shouldn't spin up a thread pool
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=None)
+    for obj, path in ((features, "features.pkl"), (model, "model.pkl")):
+        joblib.dump(obj, path + ".tmp")
+    # Flat, mmap-able copy for fast cold starts in the app
+    if isinstance(model, RandomForestClassifier):
+        save_forest(model, features, FOREST_PATH, quantize=quantize, metadata={
+            "params": {k: v for k, v in model.get_params().items()
+                       if isinstance(v, (int, float, str, bool, type(None)))},
+            **metadata,
+        })
+    os.replace("features.pkl.tmp", "features.pkl")
+    os.replace("model.pkl.tmp", "model.pkl")
+    write_model_metadata(metadata)
+    # Versioned copy for the app to hot-swap to (see registry.py)
+    return publish(metrics)
+
+
+def write_model_metadata(metadata, directory="."):
+    """model.json next to model.pkl: split, data versions and metrics of any model type.
+
+    Written after model.pkl, so it is only trusted when not older (see `model_metadata()`).
+    """
+    _write_json(os.path.join(directory, MODEL_METADATA), metadata)
+
+
+def model_metadata(model_file="model.pkl"):
+    """Training metadata saved with `model_file`; {} when missing or older than the model."""
+    path = os.path.join(os.path.dirname(model_file), MODEL_METADATA)
+    try:
+        if os.path.getmtime(path) >= os.path.getmtime(model_file):
+            with open(path) as f:
+                return json.load(f)
+    except FileNotFoundError:
+        pass
+    # Models saved before model.json carried their metadata in the forest only
+    forest = os.path.join(os.path.dirname(model_file), FOREST_PATH)
+    if forest_is_fresh(forest, model_file):
+        return load_forest(forest).metadata
+    return {}
+
+
+def refresh(model, X_train, y_train, args, metadata):
+    """Update a fitted forest in place: add `--add-trees` or replace `--replace-fraction`."""
+    if args.changed_only:
+        rows = changed_rows(metadata.get("store_version"))
+        if rows is None:
+            sys.exit("❌ No change log reaches back to this model's data; run a full retrain")
+        keep = X_train.index.isin(rows)
+        X_train, y_train = X_train[keep], y_train[keep]
+        print(f"✅ Training new trees on {len(X_train):,} changed rows")
+    if y_train.nunique() < len(model.classes_):
+        sys.exit("❌ Refresh rows do not cover every class; run a full retrain")
+
+    if args.replace_fraction:
+        n_new = max(1, round(args.replace_fraction * len(model.estimators_)))
+        # A fresh seed per refresh, so replacements differ from the trees they replace
+        seed = 42 + metadata.get("refreshes", 0) + 1
+        fresh = clone(model).set_params(n_estimators=n_new, n_jobs=args.n_jobs, random_state=seed)
+        fresh.fit(X_train, y_train)
+        # Oldest trees go first
+        model.estimators_ = model.estimators_[n_new:] + fresh.estimators_
+        return f"replaced {n_new} of {len(model.estimators_)} trees"
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + args.add_trees, n_jobs=args.n_jobs)
+    model.fit(X_train, y_train)
+    model.set_params(warm_start=False)
+    return f"added {args.add_trees} trees ({len(model.estimators_)} total)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the hit-game RandomForest.")
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--max-depth", type=int, default=None, help="cap tree depth (default: unlimited)")
+    parser.add_argument("--max-leaf-nodes", type=int, default=None, help="cap leaves per tree (default: unlimited)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="cores used for fitting (default: all)")
+    parser.add_argument("--quantize", action="store_true", help="store float16 leaf values in model.forest")
+    parser.add_argument("--hist", action="store_true",
+                        help="train HistGradientBoosting on the uint8 binned features instead")
+    parser.add_argument("--refresh", action="store_true", help="update the existing model.pkl instead of retraining")
+    parser.add_argument("--add-trees", type=int, default=30, help="--refresh: trees added with warm_start")
+    parser.add_argument("--replace-fraction", type=float, default=None,
+                        help="--refresh: retrain this share of the trees instead of adding trees")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="--refresh: fit new trees only on rows ingested since the model was trained")
+    parser.add_argument("--max-drop", type=float, default=0.005,
+                        help="--refresh: largest accepted held-out accuracy drop")
+    parser.add_argument("--search", action="store_true",
+                        help="pick the forest parameters by stratified k-fold CV (see tuning.py)")
+    parser.add_argument("--folds", type=int, default=5, help="--search: CV folds")
+    parser.add_argument("--search-iter", type=int, default=0,
+                        help="--search: sample this many random candidates instead of the full grid")
+    parser.add_argument("--prune-margin", type=float, default=0.01,
+                        help="--search: drop candidates this far behind the best after any fold")
+    parser.add_argument("--search-output", default="search.json", help="--search: per-candidate results")
+    args = parser.parse_args()
+
+    if args.hist:
+        X_train, X_test, y_train, y_test, binner = load_binned_split()
+        model = HistGradientBoostingClassifier(random_state=42)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+        accuracy = accuracy_score(y_test, model.predict(X_test))
+        print("✅ Accuracy:", accuracy)
+
+        # The binner goes in front so model.pkl still takes raw features
+        version = save_model(Pipeline([("bin", binner), ("model", model)]),
+                             metadata={"accuracy": accuracy, "fit_seconds": fit_time})
+        print(f"✅ Fit time: {fit_time:.2f}s | Peak RSS: {peak_rss_mb():.0f} MB | "
+              f"Model size: {os.path.getsize('model.pkl') / 1024 ** 2:.1f} MB")
+        print(f"✅ Saved model.pkl and features.pkl (registry version {version})")
+        return
+
+    X_train, X_test, y_train, y_test = load_split()
+
+    if args.refresh:
+        # The model being served: the registry's current version, else ./model.pkl
+        model_file = model_files(current_model())[0]
+        previous = model_metadata(model_file)
+        model = joblib.load(model_file)
+        if not isinstance(model, RandomForestClassifier):
+            sys.exit("❌ --refresh needs a RandomForest model.pkl; run a full retrain")
+        if previous.get("split") != SPLIT:
+            sys.exit("❌ The current model was evaluated on an older train/test split; run a full retrain")
+        old_accuracy = accuracy_score(y_test, model.predict(X_test))
+        start = time.perf_counter()
+        action = refresh(model, X_train, y_train, args, previous)
+        fit_time = time.perf_counter() - start
+        accuracy = accuracy_score(y_test, model.predict(X_test))
+        print(f"✅ Refresh {action} in {fit_time:.2f}s")
+        print(f"✅ Accuracy: {accuracy} (was {old_accuracy})")
+        if accuracy < old_accuracy - args.max_drop:
+            sys.exit(f"❌ Accuracy dropped by more than {args.max_drop}; keeping the current model")
+
+        full_time = previous.get("fit_seconds")
+        version = save_model(model, args.quantize, {
+            "accuracy": accuracy,
+            "fit_seconds": full_time,
+            "refresh_seconds": fit_time,
+            "refreshes": previous.get("refreshes", 0) + 1,
+        })
+        if full_time:
+            print(f"✅ Saved {full_time - fit_time:.2f}s vs the last full retrain ({full_time:.2f}s, "
+                  f"{full_time / fit_time:.1f}x)")
+        print(f"✅ Swapped in model.pkl, features.pkl and {FOREST_PATH} (registry version {version})")
+        return
+
+    metadata = {}
+    if args.search:
+        params_list = candidates(n_iter=args.search_iter)
+        print(f"✅ Searching {len(params_list)} candidates x {args.folds} folds")
+        start = time.perf_counter()
+        results = search(X_train, y_train, params_list, n_folds=args.folds,
+                         workers=None if args.n_jobs < 1 else args.n_jobs, prune_margin=args.prune_margin)
+        search_time = time.perf_counter() - start
+        for line in format_table(results):
+            print(line)
+        with open(args.search_output + ".tmp", "w") as f:
+            json.dump({"dataset_version": dataset_version(), "folds": args.folds, "results": results}, f, indent=2)
+        os.replace(args.search_output + ".tmp", args.search_output)
+        best = results[0]
+        print(f"✅ Search took {search_time:.2f}s, saved {args.search_output}")
+        print(f"✅ Best: {best['params']} (CV accuracy {best['cv_accuracy']:.4f} ± {best['cv_std']:.4f})")
+        params = best["params"]
+        metadata = {"cv_accuracy": best["cv_accuracy"], "cv_folds": args.folds}
+    else:
+        params = {"n_estimators": args.n_estimators, "max_depth": args.max_depth,
+                  "max_leaf_nodes": args.max_leaf_nodes}
+
+    # Model
+    model = RandomForestClassifier(**params, n_jobs=args.n_jobs, random_state=42)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
 
-# Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
+    # Evaluate
+    pred = model.predict(X_test)
+    accuracy = accuracy_score(y_test, pred)
+    print("✅ Accuracy:", accuracy)
 
-# Model
-model = RandomForestClassifier(n_estimators=300, random_state=42)
-model.fit(X_train, y_train)
+    # Save model + features
+    version = save_model(model, args.quantize, {"accuracy": accuracy, "fit_seconds": fit_time, **metadata})
 
-# Evaluate
-pred = model.predict(X_test)
-print("✅ Accuracy:", accuracy_score(y_test, pred))
+    print(f"✅ Fit time: {fit_time:.2f}s | Peak RSS: {peak_rss_mb():.0f} MB | "
+          f"Model size: {os.path.getsize('model.pkl') / 1024 ** 2:.1f} MB "
+          f"(forest artifact {os.path.getsize(FOREST_PATH) / 1024 ** 2:.1f} MB)")
+    print(f"✅ Saved model.pkl, features.pkl and {FOREST_PATH} (registry version {version})")
 
-# Save model + features
-joblib.dump(model, "model.pkl")
-joblib.dump(features, "features.pkl")
 
-print("✅ Saved model.pkl and features.pkl")
+if __name__ == "__main__":
+    main()
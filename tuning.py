@@ -0,0 +1,122 @@
+"""Stratified k-fold hyperparameter search for the hit-game forest.
+
+The training rows are written once as .npy files that every (spawned) worker
+process memory-maps, and every (candidate, fold) fit is queued on a process
+pool at once.  As fits finish, a candidate whose mean accuracy trails another
+candidate by more than `prune_margin` on the folds both have finished is
+dropped and its queued fits are cancelled, so poor settings usually cost one
+or two folds instead of all k, and the pool never idles between folds.
+
+Used by `python train.py --search`.
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+PARAM_GRID = {
+    "n_estimators": [100, 300],
+    "max_depth": [None, 12, 20],
+    "min_samples_leaf": [1, 5],
+    "max_features": ["sqrt", 0.5],
+}
+
+
+def candidates(grid=PARAM_GRID, n_iter=0, seed=42):
+    """Every combination of `grid`, or `n_iter` random ones."""
+    if n_iter:
+        return list(ParameterSampler(grid, n_iter=n_iter, random_state=seed))
+    return list(ParameterGrid(grid))
+
+
+def fit_fold(params, fold, data_dir):
+    """Fit one candidate on all folds but `fold` (in a worker); returns (accuracy, seconds)."""
+    X = np.load(os.path.join(data_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(data_dir, "y.npy"), mmap_mode="r")
+    folds = np.load(os.path.join(data_dir, "folds.npy"))
+    train = folds != fold
+    # One core per fit: the parallelism is across fits
+    model = RandomForestClassifier(random_state=42, n_jobs=1, **params)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    seconds = time.perf_counter() - start
+    return accuracy_score(y[~train], model.predict(X[~train])), seconds
+
+
+def _trails(result, results, prune_margin):
+    # Behind another candidate by more than the margin on the same folds
+    folds = set(result["fold_scores"])
+    mean = np.mean(list(result["fold_scores"].values()))
+    for other in results:
+        if other is result or other["pruned_after"] is not None or not folds <= set(other["fold_scores"]):
+            continue
+        if np.mean([other["fold_scores"][f] for f in folds]) - mean > prune_margin:
+            return True
+    return False
+
+
+def search(X, y, params_list, n_folds=5, workers=None, prune_margin=0.01):
+    """Cross-validate every candidate; returns one result dict per candidate, best first."""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    folds = np.empty(len(y), dtype=np.int8)
+    for i, (_, test) in enumerate(StratifiedKFold(n_folds, shuffle=True, random_state=42).split(X, y)):
+        folds[test] = i
+
+    results = [{"params": params, "fold_scores": {}, "fit_seconds": 0.0, "pruned_after": None}
+               for params in params_list]
+    with tempfile.TemporaryDirectory(prefix="search-") as data_dir:
+        for name, values in (("X", X), ("y", y), ("folds", folds)):
+            np.save(os.path.join(data_dir, f"{name}.npy"), values)
+        # Spawned like benchmark.py's workers, so they don't inherit the parent's memory
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Every (candidate, fold) fit is queued up front, fold by fold, so
+            # the pool never waits for a round to finish
+            pending = {}
+            for fold in range(n_folds):
+                for result in results:
+                    future = pool.submit(fit_fold, result["params"], fold, data_dir)
+                    pending[future] = (result, fold)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result, fold = pending.pop(future)
+                    if future.cancelled():
+                        continue
+                    accuracy, seconds = future.result()
+                    result["fit_seconds"] += seconds
+                    if result["pruned_after"] is not None:
+                        continue
+                    result["fold_scores"][fold] = accuracy
+                # Early stopping: drop candidates clearly behind on the folds they share
+                for result in results:
+                    if (result["pruned_after"] is None and 0 < len(result["fold_scores"]) < n_folds
+                            and _trails(result, results, prune_margin)):
+                        result["pruned_after"] = len(result["fold_scores"])
+                        for future, (owner, _) in pending.items():
+                            if owner is result:
+                                future.cancel()
+
+    for result in results:
+        fold_scores = result.pop("fold_scores")
+        result["scores"] = [fold_scores[f] for f in sorted(fold_scores)]
+        result["cv_accuracy"] = float(np.mean(result["scores"]))
+        result["cv_std"] = float(np.std(result["scores"]))
+    # Completed candidates rank above pruned ones
+    return sorted(results, key=lambda r: (r["pruned_after"] is None, r["cv_accuracy"]), reverse=True)
+
+
+def format_table(results):
+    """Per-candidate accuracy and time as printable lines."""
+    lines = [f"{'cv acc':>8}{'± std':>8}{'folds':>7}{'fit s':>8}  params"]
+    for r in results:
+        status = f"  (pruned after {r['pruned_after']})" if r["pruned_after"] else ""
+        lines.append(f"{r['cv_accuracy']:>8.4f}{r['cv_std']:>8.4f}{len(r['scores']):>7}{r['fit_seconds']:>8.2f}  "
+                     f"{r['params']}{status}")
+    return lines
@@ -0,0 +1,43 @@
+"""Background warm-up for app.py.
+
+`warm_up(*tasks)` runs the tasks once per server process in a daemon thread,
+while the first script run renders the header and sidebar.  The tasks fill
+the same `st.cache_resource` caches the script reads, and Streamlit computes
+each cache entry once, so a script run that needs an entry before the thread
+has finished waits for it instead of loading it a second time.
+"""
+import sys
+import threading
+
+from instrument import timed
+
+_lock = threading.Lock()
+_started = False
+
+
+def warm_up(*tasks):
+    """Start the warm-up thread unless this process already did; returns it (or None)."""
+    global _started
+    with _lock:
+        if _started:
+            return None
+        _started = True
+    thread = threading.Thread(target=_run, args=(tasks,), name="warm-up", daemon=True)
+    try:
+        # Lets the cached functions run outside the script thread without warnings
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+        add_script_run_ctx(thread)
+    except ImportError:
+        pass
+    thread.start()
+    return thread
+
+
+def _run(tasks):
+    for task in tasks:
+        try:
+            with timed(f"warm_up.{task.__name__}"):
+                task()
+        except Exception as e:
+            # The script run loads (and reports) the same thing again
+            print(f"⚠️ Warm-up {task.__name__} failed: {e}", file=sys.stderr)